@@ -0,0 +1,64 @@
+import importlib
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from .services.library_service import LibraryService
+
+# Providers are registered as "module:attribute" paths and only imported on first use,
+# so importing a router does not pull in the service and storage graph.
+_PROVIDERS: Dict[str, str] = {
+    "library_service": ".services.library_service:LibraryService",
+}
+
+STORAGE_BACKENDS: Dict[str, str] = {
+    "json": ".services.data_storage:DataStorage",
+}
+
+_resolved: Dict[str, Callable[[], Any]] = {}
+_instances: Dict[str, Any] = {}
+# Sync dependencies run in the threadpool, so concurrent first requests must share one creation
+_lock = threading.RLock()
+
+
+def _import_path(path: str) -> Any:
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name, __package__), attribute)
+
+
+def register_provider(name: str, path: str):
+    """Register or replace a provider, dropping any instance already created"""
+    with _lock:
+        _PROVIDERS[name] = path
+        _resolved.pop(name, None)
+        _instances.pop(name, None)
+
+
+def get_provider(name: str) -> Any:
+    """Return the shared instance for a provider, importing and creating it on first use"""
+    instance = _instances.get(name)
+    if instance is not None:
+        return instance
+    with _lock:
+        instance = _instances.get(name)
+        if instance is None:
+            factory = _resolved.get(name)
+            if factory is None:
+                if name not in _PROVIDERS:
+                    raise KeyError(f"No provider registered for '{name}'")
+                factory = _resolved[name] = _import_path(_PROVIDERS[name])
+            instance = _instances[name] = factory()
+        return instance
+
+
+def load_storage_backend(name: Optional[str] = None) -> Any:
+    """Create the storage backend selected by LIBRARY_STORAGE_BACKEND (default: json)"""
+    name = name or os.getenv("LIBRARY_STORAGE_BACKEND", "json")
+    if name not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {name}")
+    return _import_path(STORAGE_BACKENDS[name])()
+
+
+def get_library_service() -> "LibraryService":
+    return get_provider("library_service")
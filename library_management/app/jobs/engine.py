@@ -0,0 +1,272 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
+from .sinks import JobSink
+
+if TYPE_CHECKING:
+    from ..services.data_storage import DataStorage
+
+logger = logging.getLogger(__name__)
+
+class Schedule:
+    """Run every ``every_seconds``, or daily at ``daily_at`` ("HH:MM", local time)"""
+
+    def __init__(self, every_seconds: Optional[float] = None, daily_at: Optional[str] = None):
+        if (every_seconds is None) == (daily_at is None):
+            raise ValueError("Give exactly one of every_seconds or daily_at")
+        self.every_seconds = every_seconds
+        self.daily_at = None
+        if daily_at is not None:
+            hour, minute = (int(part) for part in daily_at.split(":"))
+            self.daily_at = (hour, minute)
+
+    def next_run(self, after: datetime) -> datetime:
+        if self.every_seconds is not None:
+            return after + timedelta(seconds=self.every_seconds)
+        hour, minute = self.daily_at
+        candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if candidate <= after:
+            candidate += timedelta(days=1)
+        return candidate
+
+
+Processor = Callable[[Dict[str, Any], datetime], Optional[Dict[str, Any]]]
+
+
+class BatchJob:
+    """A job that streams one collection once and feeds every record to each processor.
+
+    ``processors`` maps an output name to ``process(record, as_of)``, which
+    returns zero or one output record; each output is written to the sink
+    under its own name. ``as_of`` is the run's reference time, kept in the
+    checkpoint so a resumed run evaluates records the same way.
+    """
+
+    def __init__(self, name: str, collection: str, processors: Dict[str, Processor],
+                 schedule: Schedule, chunk_size: int = 500):
+        self.name = name
+        self.collection = collection
+        self.processors = processors
+        self.schedule = schedule
+        self.chunk_size = chunk_size
+
+
+class CheckpointStore:
+    """Per-job progress kept in a small JSON file, replaced atomically on each save"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        with open(self.path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def get(self, job_name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._read().get(job_name)
+
+    def save(self, job_name: str, checkpoint: Dict[str, Any]):
+        with self._lock:
+            checkpoints = self._read()
+            checkpoints[job_name] = checkpoint
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(checkpoints, file, indent=4)
+            temp_path.replace(self.path)
+
+
+class JobRunner:
+    """Streams a collection through a job's processors in chunks, checkpointing after each one.
+
+    Output is written to the sink before the checkpoint moves forward, so a
+    crash can repeat at most one chunk after a restart (at-least-once). A
+    resumed run continues after the last checkpointed record ID. The pause
+    between chunks gives the event loop and request threads the GIL, and
+    ``stop()`` makes a run return after its current chunk.
+    """
+
+    def __init__(self, storage: "DataStorage", checkpoints: CheckpointStore,
+                 pause_seconds: float = 0.005):
+        self.storage = storage
+        self.checkpoints = checkpoints
+        self.pause_seconds = pause_seconds
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def resume(self):
+        self._stop.clear()
+
+    def _records_after(self, collection: str, last_id: Optional[str]) -> Iterator[Dict[str, Any]]:
+        records = self.storage.iter_collection(collection)
+        if last_id is None:
+            yield from records
+            return
+        for record in records:
+            if record.get("id") == last_id:
+                yield from records
+                return
+        # The last processed record is gone (deleted, or the file was restored),
+        # so start over rather than skip records that were never processed
+        yield from self.storage.iter_collection(collection)
+
+    def run(self, job: BatchJob, sink: JobSink) -> Optional[Dict[str, Any]]:
+        """Run or resume a job; returns its checkpoint, or None if stopped before starting"""
+        if self._stop.is_set():
+            return None
+        checkpoint = self.checkpoints.get(job.name)
+        if checkpoint and not checkpoint.get("completed"):
+            # Resume the interrupted run where it left off
+            checkpoint = dict(checkpoint)
+            checkpoint.pop("error", None)
+            checkpoint.pop("failed_at", None)
+        else:
+            now = datetime.now()
+            checkpoint = {
+                "run_id": f"{job.name}-{now:%Y%m%dT%H%M%S}",
+                "as_of": now.isoformat(),
+                "started_at": now.isoformat(),
+                "processed": 0,
+                "emitted": {output: 0 for output in job.processors},
+                "completed": False,
+            }
+            self.checkpoints.save(job.name, checkpoint)
+
+        as_of = datetime.fromisoformat(checkpoint["as_of"])
+        records = self._records_after(job.collection, checkpoint.get("last_id"))
+        while not self._stop.is_set():
+            chunk = list(islice(records, job.chunk_size))
+            if not chunk:
+                break
+            for output, process in job.processors.items():
+                records_out: List[Dict[str, Any]] = []
+                for record in chunk:
+                    result = process(record, as_of)
+                    if result is not None:
+                        records_out.append(result)
+                sink.write(output, checkpoint["run_id"], records_out)
+                checkpoint["emitted"][output] += len(records_out)
+
+            checkpoint["processed"] += len(chunk)
+            checkpoint["last_id"] = chunk[-1].get("id")
+            self.checkpoints.save(job.name, checkpoint)
+            if self.pause_seconds:
+                time.sleep(self.pause_seconds)
+        else:
+            # Stopped between chunks; the next start resumes from the checkpoint
+            return checkpoint
+
+        checkpoint["completed"] = True
+        checkpoint["finished_at"] = datetime.now().isoformat()
+        self.checkpoints.save(job.name, checkpoint)
+        return checkpoint
+
+
+class JobScheduler:
+    """Runs registered jobs on their schedules from a background asyncio task.
+
+    Jobs run in worker threads, at most ``max_concurrent_jobs`` at a time. On
+    start, an interrupted run is resumed right away, and a job whose last run
+    is older than its schedule allows is run immediately. A run that raises is
+    logged, its error is stored in the checkpoint, and it resumes from there
+    at the next scheduled time.
+    """
+
+    def __init__(self, runner: JobRunner, max_concurrent_jobs: int = 1,
+                 poll_seconds: float = 30.0):
+        self.runner = runner
+        self.poll_seconds = poll_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrent_jobs)
+        self._jobs: Dict[str, BatchJob] = {}
+        self._sinks: Dict[str, JobSink] = {}
+        self._next_run: Dict[str, datetime] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, job: BatchJob, sink: JobSink):
+        self._jobs[job.name] = job
+        self._sinks[job.name] = sink
+        self._next_run[job.name] = self._initial_run_time(job)
+
+    def _initial_run_time(self, job: BatchJob) -> datetime:
+        now = datetime.now()
+        checkpoint = self.runner.checkpoints.get(job.name)
+        if checkpoint is None:
+            return job.schedule.next_run(now)
+        if not checkpoint.get("completed"):
+            return now
+        # A run missed while the app was down comes out in the past, so it runs straight away
+        return job.schedule.next_run(datetime.fromisoformat(checkpoint["finished_at"]))
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [{
+            "name": name,
+            "running": name in self._running,
+            "next_run": self._next_run[name].isoformat(),
+            "checkpoint": self.runner.checkpoints.get(name),
+        } for name in self._jobs]
+
+    def start(self):
+        if self._task is None:
+            self.runner.resume()
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self):
+        """Stop scheduling, let running jobs finish their current chunk, then close the sinks"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.runner.stop()
+        await asyncio.gather(*self._running.values(), return_exceptions=True)
+        for sink in {id(sink): sink for sink in self._sinks.values()}.values():
+            sink.close()
+
+    async def run_now(self, name: str) -> Optional[Dict[str, Any]]:
+        task = self._running.get(name)
+        if task is None:
+            task = self._running[name] = asyncio.get_running_loop().create_task(self._run(self._jobs[name]))
+        return await task
+
+    def _record_failure(self, job_name: str, error: Exception) -> Optional[Dict[str, Any]]:
+        """Add the error to the interrupted run's checkpoint, so status() shows it"""
+        try:
+            checkpoint = self.runner.checkpoints.get(job_name)
+            if checkpoint is None:
+                return None
+            checkpoint["error"] = f"{type(error).__name__}: {error}"
+            checkpoint["failed_at"] = datetime.now().isoformat()
+            self.runner.checkpoints.save(job_name, checkpoint)
+            return checkpoint
+        except Exception:
+            logger.exception("Could not record the failure of job %s", job_name)
+            return None
+
+    async def _loop(self):
+        while True:
+            now = datetime.now()
+            for name, job in self._jobs.items():
+                if name not in self._running and self._next_run[name] <= now:
+                    self._running[name] = asyncio.get_running_loop().create_task(self._run(job))
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _run(self, job: BatchJob) -> Optional[Dict[str, Any]]:
+        try:
+            async with self._semaphore:
+                return await asyncio.to_thread(self.runner.run, job, self._sinks[job.name])
+        except Exception as e:
+            logger.exception("Job %s failed", job.name)
+            return await asyncio.to_thread(self._record_failure, job.name, e)
+        finally:
+            self._running.pop(job.name, None)
+            self._next_run[job.name] = job.schedule.next_run(datetime.now())
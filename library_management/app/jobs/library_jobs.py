@@ -0,0 +1,168 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from .engine import BatchJob, CheckpointStore, JobRunner, JobScheduler, Schedule
+from .sinks import JobSink, JsonLinesSink, SQLiteOutboxSink
+
+if TYPE_CHECKING:
+    from ..services.data_storage import DataStorage
+
+DEFAULT_LOAN_DAYS = 14
+DEFAULT_HOLD_DAYS = 3
+DEFAULT_STALE_LOAN_DAYS = 60
+
+
+def _age_in_days(timestamp: Optional[str], as_of: datetime) -> Optional[int]:
+    if not timestamp:
+        return None
+    return (as_of - datetime.fromisoformat(timestamp)).days
+
+
+def overdue_reminder(book: Dict[str, Any], as_of: datetime,
+                     loan_days: int = DEFAULT_LOAN_DAYS) -> Optional[Dict[str, Any]]:
+    """Reminder for a borrowed book past its loan period"""
+    if book.get("status") != "borrowed":
+        return None
+    age = _age_in_days(book.get("borrowed_date"), as_of)
+    if age is None or age <= loan_days:
+        return None
+    return {
+        "type": "overdue_reminder",
+        "book_id": book["id"],
+        "title": book.get("title"),
+        "member_id": book.get("borrowed_by"),
+        "borrowed_date": book.get("borrowed_date"),
+        "days_overdue": age - loan_days,
+    }
+
+
+def expired_hold(book: Dict[str, Any], as_of: datetime,
+                 hold_days: int = DEFAULT_HOLD_DAYS) -> Optional[Dict[str, Any]]:
+    """Expiry notice for a book that has stayed reserved longer than the hold period.
+
+    The hold is timed from ``reserved_date`` when the record has one. Book
+    records don't store it yet, so it falls back to ``updated_at``, which
+    restarts on any save of the book: editing a reserved book's details gives
+    it a fresh hold period.
+    """
+    if book.get("status") != "reserved":
+        return None
+    reserved_since = book.get("reserved_date") or book.get("updated_at")
+    age = _age_in_days(reserved_since, as_of)
+    if age is None or age <= hold_days:
+        return None
+    return {
+        "type": "hold_expired",
+        "book_id": book["id"],
+        "title": book.get("title"),
+        "reserved_since": reserved_since,
+        "days_reserved": age,
+    }
+
+
+def stale_loan(book: Dict[str, Any], as_of: datetime,
+               stale_days: int = DEFAULT_STALE_LOAN_DAYS) -> Optional[Dict[str, Any]]:
+    """Report row for a loan open long enough to be treated as lost"""
+    if book.get("status") != "borrowed":
+        return None
+    age = _age_in_days(book.get("borrowed_date"), as_of)
+    if age is None or age <= stale_days:
+        return None
+    return {
+        "type": "stale_loan",
+        "book_id": book["id"],
+        "title": book.get("title"),
+        "isbn": book.get("isbn"),
+        "member_id": book.get("borrowed_by"),
+        "borrowed_date": book.get("borrowed_date"),
+        "days_on_loan": age,
+    }
+
+
+def jobs_settings_from_env() -> Dict[str, Any]:
+    """Read job settings from JOBS_* environment variables"""
+    return {
+        "enabled": os.getenv("JOBS_ENABLED", "0") == "1",
+        "jobs_dir": os.getenv("JOBS_DIR", "data/jobs"),
+        "sink": os.getenv("JOBS_SINK", "jsonl"),
+        "run_at": os.getenv("JOBS_RUN_AT", "02:00"),
+        "chunk_size": int(os.getenv("JOBS_CHUNK_SIZE", "500")),
+        "pause_seconds": float(os.getenv("JOBS_PAUSE_SECONDS", "0.005")),
+        "max_concurrent_jobs": int(os.getenv("JOBS_MAX_CONCURRENT", "1")),
+        "loan_days": int(os.getenv("JOBS_LOAN_DAYS", str(DEFAULT_LOAN_DAYS))),
+        "hold_days": int(os.getenv("JOBS_HOLD_DAYS", str(DEFAULT_HOLD_DAYS))),
+        "stale_loan_days": int(os.getenv("JOBS_STALE_LOAN_DAYS", str(DEFAULT_STALE_LOAN_DAYS))),
+    }
+
+
+def build_sink(name: str, jobs_dir: str) -> JobSink:
+    if name == "jsonl":
+        return JsonLinesSink(str(Path(jobs_dir) / "output"))
+    if name == "outbox":
+        return SQLiteOutboxSink(str(Path(jobs_dir) / "outbox.db"))
+    raise ValueError(f"Unknown job sink: {name}")
+
+
+def build_jobs(settings: Dict[str, Any]) -> List[BatchJob]:
+    # All three nightly outputs come from one streaming pass over the books
+    return [
+        BatchJob("nightly_loans", "books", {
+            "overdue_reminders": lambda book, as_of: overdue_reminder(book, as_of, settings["loan_days"]),
+            "hold_expiry": lambda book, as_of: expired_hold(book, as_of, settings["hold_days"]),
+            "stale_loan_report": lambda book, as_of: stale_loan(book, as_of, settings["stale_loan_days"]),
+        }, Schedule(daily_at=settings["run_at"]), settings["chunk_size"]),
+    ]
+
+
+def build_scheduler(storage: "DataStorage", settings: Dict[str, Any]) -> JobScheduler:
+    checkpoints = CheckpointStore(str(Path(settings["jobs_dir"]) / "checkpoints.json"))
+    runner = JobRunner(storage, checkpoints, settings["pause_seconds"])
+    scheduler = JobScheduler(runner, settings["max_concurrent_jobs"])
+    sink = build_sink(settings["sink"], settings["jobs_dir"])
+    for job in build_jobs(settings):
+        scheduler.register(job, sink)
+    return scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run or inspect the library batch jobs")
+    parser.add_argument("command", choices=["run", "status"])
+    parser.add_argument("job", nargs="?", help="Job to run (default: all)")
+    parser.add_argument("--data-file", default="data/library_data.json")
+    args = parser.parse_args()
+
+    from ..services.data_storage import DataStorage
+    scheduler = build_scheduler(DataStorage(args.data_file), jobs_settings_from_env())
+    if args.command == "status":
+        print(json.dumps(scheduler.status(), indent=2))
+        return
+
+    names = [job["name"] for job in scheduler.status()]
+    if args.job:
+        if args.job not in names:
+            parser.error(f"unknown job {args.job!r} (choose from {', '.join(names)})")
+        names = [args.job]
+
+    async def run_jobs():
+        try:
+            for name in names:
+                checkpoint = await scheduler.run_now(name)
+                if checkpoint is None or "error" in checkpoint:
+                    error = checkpoint["error"] if checkpoint else "stopped before it started"
+                    sys.exit(f"{name}: failed: {error}")
+                emitted = ", ".join(f"{count} {output}" for output, count in checkpoint["emitted"].items())
+                print(f"{name}: {checkpoint['processed']} records scanned, "
+                      f"emitted {emitted} ({checkpoint['run_id']})")
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(run_jobs())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+class JobSink(ABC):
+    """Abstract destination for the records a batch job emits"""
+
+    @abstractmethod
+    def write(self, output: str, run_id: str, records: List[Dict[str, Any]]):
+        """Persist one chunk's records for the named job output"""
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonLinesSink(JobSink):
+    """Appends records as JSON lines to one file per job output"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, output: str, run_id: str, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        lines = "".join(json.dumps({"run_id": run_id, **record}) + "\n" for record in records)
+        with open(self.directory / f"{output}.jsonl", 'a', encoding='utf-8') as file:
+            file.write(lines)
+
+
+class SQLiteOutboxSink(JobSink):
+    """Inserts records into an outbox table for a separate sender to deliver"""
+
+    def __init__(self, database: str):
+        Path(database).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(database, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " output TEXT NOT NULL,"
+                " run_id TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " created_at TEXT NOT NULL,"
+                " sent_at TEXT)"
+            )
+
+    def write(self, output: str, run_id: str, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        created_at = datetime.now().isoformat()
+        rows = [(output, run_id, json.dumps(record), created_at) for record in records]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO outbox (output, run_id, payload, created_at) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def close(self):
+        self._connection.close()
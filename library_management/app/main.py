@@ -1,10 +1,16 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from .routers.books import books_router
 from .routers.authors import  authors_router
 from .routers.members import  members_router
-import uvicorn
+from .routers.stats import stats_router
+from .routers.admin import admin_router
+from .middleware.rate_limit import RateLimitMiddleware, rate_limit_settings_from_env
+from .middleware.profiling import ProfilingMiddleware, profiling_settings_from_env
+from .middleware.idempotency import IdempotencyMiddleware, idempotency_settings_from_env
+import os
 
 # Create FastAPI application
 app = FastAPI(
@@ -15,6 +21,18 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Opt-in request profiling (X-Profile-Token header or PROFILING_SAMPLE_RATE)
+app.add_middleware(ProfilingMiddleware, **profiling_settings_from_env())
+
+# Replay responses for retried requests that send an Idempotency-Key header
+app.add_middleware(IdempotencyMiddleware, **idempotency_settings_from_env())
+
+# Compress responses (including streamed lists) above the size threshold
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1024")))
+
+# Add rate limiting and admission control (inside CORS so 429/503 responses keep CORS headers)
+app.add_middleware(RateLimitMiddleware, **rate_limit_settings_from_env())
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +46,25 @@ app.add_middleware(
 app.include_router(authors_router, prefix="/api/v1")
 app.include_router(books_router, prefix="/api/v1")
 app.include_router(members_router, prefix="/api/v1")
+app.include_router(stats_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
+
+# Nightly batch jobs (overdue reminders, hold expiry, stale loans); enable with JOBS_ENABLED=1
+# on a single worker so notifications are not sent once per process
+@app.on_event("startup")
+async def start_job_scheduler():
+    from .jobs.library_jobs import build_scheduler, jobs_settings_from_env
+    settings = jobs_settings_from_env()
+    if settings["enabled"]:
+        from .dependencies import get_library_service
+        app.state.job_scheduler = build_scheduler(get_library_service().storage, settings)
+        app.state.job_scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_job_scheduler():
+    scheduler = getattr(app.state, "job_scheduler", None)
+    if scheduler is not None:
+        await scheduler.stop()
 
 # Root endpoint
 @app.get("/")
@@ -54,4 +91,5 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 # Run the app only if executed directly
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from fastapi.responses import JSONResponse
+
+KEY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+MAX_KEY_LENGTH = 255
+
+
+class StoredResponse:
+    """A completed response kept for replay, with a fingerprint of its request body"""
+
+    __slots__ = ("fingerprint", "status", "headers", "body", "expires_at")
+
+    def __init__(self, fingerprint: str, status: int, headers: List[Tuple[bytes, bytes]],
+                 body: bytes, expires_at: float):
+        self.fingerprint = fingerprint
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.expires_at = expires_at
+
+
+class IdempotencyStore:
+    """Bounded TTL store of recent responses.
+
+    Every entry has the same TTL, so insertion order is also expiry order and
+    expired entries are always at the front.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600.0, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, StoredResponse]" = OrderedDict()
+
+    def get(self, key: Tuple, now: float) -> Optional[StoredResponse]:
+        self._expire(now)
+        return self._entries.get(key)
+
+    def put(self, key: Tuple, response: StoredResponse):
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _expire(self, now: float):
+        while self._entries:
+            first = next(iter(self._entries.values()))
+            if first.expires_at > now:
+                break
+            self._entries.popitem(last=False)
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware honouring the Idempotency-Key header on mutating requests.
+
+    The first request with a key runs normally and its response is stored. Retries
+    from the same client with the same key, method and path get the stored response
+    back without touching storage; keys are scoped per client, so one client can't
+    collide with (or read) another's responses. Duplicates that arrive while the first is still running wait
+    for it (single-flight) instead of executing again. Reusing a key with a
+    different body is rejected with 422. Responses with 5xx status are not stored,
+    so those requests can be retried. The store is per process.
+    """
+
+    def __init__(self, app, ttl_seconds: float = 3600.0, max_entries: int = 10000,
+                 max_body_bytes: int = 1024 * 1024,
+                 methods: Iterable[str] = ("POST", "PATCH")):
+        self.app = app
+        self.store = IdempotencyStore(ttl_seconds, max_entries)
+        self.max_body_bytes = max_body_bytes
+        self.methods = frozenset(methods)
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = None
+        for name, value in scope["headers"]:
+            if name == KEY_HEADER:
+                idempotency_key = value
+                break
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            response = JSONResponse(status_code=400, content={"detail": "Invalid Idempotency-Key header"})
+            await response(scope, receive, send)
+            return
+
+        body = await self._read_body(receive)
+        fingerprint = hashlib.sha256(body).hexdigest()
+        key = (self._client_key(scope), scope["method"], scope["path"], idempotency_key)
+
+        # Wait for an in-flight duplicate; if it stored nothing, run the request ourselves
+        while True:
+            stored = self.store.get(key, time.monotonic())
+            pending = self._in_flight.get(key)
+            if stored is not None or pending is None:
+                break
+            await asyncio.shield(pending)
+
+        if stored is not None:
+            if stored.fingerprint != fingerprint:
+                response = JSONResponse(
+                    status_code=422,
+                    content={"detail": "Idempotency-Key was already used with a different request"}
+                )
+                await response(scope, receive, send)
+                return
+            await self._replay(stored, send)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            await self._execute(key, fingerprint, body, scope, receive, send)
+        finally:
+            del self._in_flight[key]
+            future.set_result(None)
+
+    @staticmethod
+    def _client_key(scope) -> str:
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def _execute(self, key: Tuple, fingerprint: str, body: bytes, scope, receive, send):
+        """Run the request, forwarding the response while keeping a copy to store"""
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+        size = 0
+
+        async def capture_send(message):
+            nonlocal size
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body" and size <= self.max_body_bytes:
+                chunk = message.get("body", b"")
+                chunks.append(chunk)
+                size += len(chunk)
+            await send(message)
+
+        await self.app(scope, replay_receive, capture_send)
+
+        if start and start["status"] < 500 and size <= self.max_body_bytes:
+            self.store.put(key, StoredResponse(
+                fingerprint, start["status"], list(start.get("headers", [])), b"".join(chunks),
+                time.monotonic() + self.store.ttl_seconds
+            ))
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    async def _replay(stored: StoredResponse, send):
+        await send({
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": stored.headers + [REPLAYED_HEADER],
+        })
+        await send({"type": "http.response.body", "body": stored.body})
+
+
+def idempotency_settings_from_env() -> Dict[str, Any]:
+    """Read IdempotencyMiddleware settings from IDEMPOTENCY_* environment variables"""
+    settings: Dict[str, Any] = {}
+    for name, cast in (("ttl_seconds", float), ("max_entries", int), ("max_body_bytes", int)):
+        value = os.getenv(f"IDEMPOTENCY_{name.upper()}")
+        if value is not None:
+            settings[name] = cast(value)
+    return settings
@@ -0,0 +1,333 @@
+import functools
+import hmac
+import itertools
+import marshal
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Set
+import anyio.to_thread
+
+# cProfile and pstats are imported on the first capture, so a disabled
+# profiler adds nothing to startup
+if TYPE_CHECKING:
+    import cProfile
+
+# Before 3.12 a cProfile.Profile only sees the thread that enabled it, so each
+# worker thread needs its own. From 3.12 it hooks sys.monitoring, which covers
+# every thread and allows only one enabled profiler, so the request's profiler
+# records the worker threads too.
+_PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+CPROFILE = "cprofile"
+SAMPLE = "sample"
+
+TOKEN_HEADER = b"x-profile-token"
+MODE_HEADER = b"x-profile-mode"
+
+
+class ProfileCapture:
+    """One captured request; data is pstats (marshal) or collapsed-stack text"""
+
+    def __init__(self, capture_id: int, mode: str, method: str, path: str,
+                 started_at: datetime, duration_ms: float, data: bytes):
+        self.id = capture_id
+        self.mode = mode
+        self.method = method
+        self.path = path
+        self.started_at = started_at
+        self.duration_ms = duration_ms
+        self.data = data
+
+    @property
+    def filename(self) -> str:
+        extension = "pstats" if self.mode == CPROFILE else "collapsed.txt"
+        return f"profile-{self.id}.{extension}"
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 3),
+            "size_bytes": len(self.data),
+        }
+
+
+class ProfileStore:
+    """Bounded ring buffer of recent captures; the oldest is dropped when full"""
+
+    def __init__(self, max_captures: int = 20):
+        self._captures: Deque[ProfileCapture] = deque(maxlen=max_captures)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def resize(self, max_captures: int):
+        with self._lock:
+            self._captures = deque(self._captures, maxlen=max_captures)
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, capture: ProfileCapture):
+        with self._lock:
+            self._captures.append(capture)
+
+    def list(self) -> List[ProfileCapture]:
+        with self._lock:
+            return list(reversed(self._captures))
+
+    def get(self, capture_id: int) -> Optional[ProfileCapture]:
+        with self._lock:
+            for capture in self._captures:
+                if capture.id == capture_id:
+                    return capture
+        return None
+
+
+profile_store = ProfileStore()
+
+
+class _WorkerCapture:
+    """Profiles the parts of a request that run in worker threads.
+
+    Sync endpoints and dependencies, response serialization and streaming
+    iterators all run through ``anyio.to_thread.run_sync``. While a capture is
+    active for the current request, each of those calls runs under a profiler
+    owned by the worker thread (cprofile before Python 3.12) or registers its
+    thread with the sampler (sample).
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.profilers: Dict[int, "cProfile.Profile"] = {}
+        self._threads: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def run(self, func: Callable[..., Any], *args) -> Any:
+        thread_id = threading.get_ident()
+        if self.mode == CPROFILE:
+            import cProfile
+            with self._lock:
+                profiler = self.profilers.setdefault(thread_id, cProfile.Profile())
+            profiler.enable()
+            try:
+                return func(*args)
+            finally:
+                profiler.disable()
+
+        with self._lock:
+            self._threads.add(thread_id)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._threads.discard(thread_id)
+
+    def active_threads(self) -> Set[int]:
+        with self._lock:
+            return set(self._threads)
+
+
+_active_capture: ContextVar[Optional[_WorkerCapture]] = ContextVar("profiling_capture", default=None)
+_original_run_sync: Callable[..., Any] = anyio.to_thread.run_sync
+_hook_lock = threading.Lock()
+_hook_users = 0
+
+
+async def _run_sync_with_capture(func, *args, **kwargs):
+    capture = _active_capture.get()
+    if capture is not None:
+        func = functools.partial(capture.run, func)
+    return await _original_run_sync(func, *args, **kwargs)
+
+
+@contextmanager
+def _worker_hook(capture: _WorkerCapture):
+    """Route the current request's threadpool calls through ``capture`` while it runs.
+
+    ``anyio.to_thread.run_sync`` is only replaced while at least one capture
+    needs it, and is put back once the last one finishes.
+    """
+    global _original_run_sync, _hook_users
+    with _hook_lock:
+        if _hook_users == 0:
+            _original_run_sync = anyio.to_thread.run_sync
+            anyio.to_thread.run_sync = _run_sync_with_capture
+        _hook_users += 1
+    context_token = _active_capture.set(capture)
+    try:
+        yield
+    finally:
+        _active_capture.reset(context_token)
+        with _hook_lock:
+            _hook_users -= 1
+            # Leave it alone if something else has replaced it since
+            if _hook_users == 0 and anyio.to_thread.run_sync is _run_sync_with_capture:
+                anyio.to_thread.run_sync = _original_run_sync
+
+
+class _StackSampler:
+    """Samples a request's stacks on a background thread and counts collapsed stacks.
+
+    Worker threads running the request's code are sampled while they run it;
+    the event-loop thread is sampled only when none are.
+    """
+
+    def __init__(self, thread_id: int, capture: _WorkerCapture, interval: float):
+        self._thread_id = thread_id
+        self._capture = capture
+        self._interval = interval
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiling-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> bytes:
+        self._stop.set()
+        self._thread.join()
+        lines = [f"{stack} {count}" for stack, count in self._stacks.most_common()]
+        return "\n".join(lines).encode("utf-8")
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            thread_ids = self._capture.active_threads() or {self._thread_id}
+            current_frames = sys._current_frames()
+            for thread_id in thread_ids:
+                frame = current_frames.get(thread_id)
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                if frames:
+                    self._stacks[";".join(reversed(frames))] += 1
+
+
+class ProfilingMiddleware:
+    """Opt-in ASGI profiling for selected requests.
+
+    A request is profiled when it carries ``X-Profile-Token`` matching the
+    configured token (``X-Profile-Mode`` picks cprofile or sample), or when it
+    is picked at ``sample_rate``. The profile covers everything the event loop
+    runs while the request is in flight, not just this request, plus the
+    request's own work in threadpool workers. Only one capture runs at a time.
+    With no token and a zero rate every request is passed straight through.
+    From Python 3.12, if a debugger or another profiler already holds the
+    profiling hook, a cprofile request is served without a capture.
+    """
+
+    def __init__(self, app, token: Optional[str] = None, sample_rate: float = 0.0,
+                 mode: str = CPROFILE, sample_interval_ms: float = 5.0,
+                 max_captures: int = 20, store: ProfileStore = profile_store):
+        if mode not in (CPROFILE, SAMPLE):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.app = app
+        self.token = token.encode("latin-1") if token else None
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.sample_interval = sample_interval_ms / 1000
+        self.store = store
+        self.store.resize(max_captures)
+        self.enabled = bool(self.token) or sample_rate > 0
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = self._select_mode(scope)
+        if mode is None or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profile(mode, scope, receive, send)
+        finally:
+            self._busy.release()
+
+    def _select_mode(self, scope) -> Optional[str]:
+        if self.token:
+            headers = dict(scope["headers"])
+            if hmac.compare_digest(headers.get(TOKEN_HEADER, b""), self.token):
+                requested = headers.get(MODE_HEADER, b"").decode("latin-1").lower()
+                return requested if requested in (CPROFILE, SAMPLE) else self.mode
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return self.mode
+        return None
+
+    async def _profile(self, mode: str, scope, receive, send):
+        profiler = None
+        if mode == CPROFILE:
+            import cProfile
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+: sys.monitoring's profiler slot is already taken
+                await self.app(scope, receive, send)
+                return
+
+        capture_id = self.store.next_id()
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", str(capture_id).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        capture = _WorkerCapture(mode)
+        started_at = datetime.now()
+        start = time.perf_counter()
+        if profiler is not None:
+            try:
+                if _PER_THREAD_PROFILERS:
+                    with _worker_hook(capture):
+                        await self.app(scope, receive, send_with_id)
+                else:
+                    await self.app(scope, receive, send_with_id)
+            finally:
+                profiler.disable()
+                data = self._dump_pstats(profiler, capture)
+        else:
+            sampler = _StackSampler(threading.get_ident(), capture, self.sample_interval)
+            sampler.start()
+            try:
+                with _worker_hook(capture):
+                    await self.app(scope, receive, send_with_id)
+            finally:
+                data = sampler.stop()
+
+        self.store.add(ProfileCapture(capture_id, mode, scope["method"], scope["path"],
+                                      started_at, (time.perf_counter() - start) * 1000, data))
+
+    @staticmethod
+    def _dump_pstats(profiler: "cProfile.Profile", capture: _WorkerCapture) -> bytes:
+        # Same format as pstats.Stats.dump_stats, so pstats.Stats(path) can load it
+        import pstats
+        stats = pstats.Stats(profiler)
+        for worker_profiler in capture.profilers.values():
+            stats.add(worker_profiler)
+        return marshal.dumps(stats.stats)
+
+
+def profiling_settings_from_env() -> Dict[str, Any]:
+    """Read ProfilingMiddleware settings from PROFILING_* environment variables"""
+    settings: Dict[str, Any] = {}
+    for name, cast in (("token", str), ("sample_rate", float), ("mode", str),
+                       ("sample_interval_ms", float), ("max_captures", int)):
+        value = os.getenv(f"PROFILING_{name.upper()}")
+        if value is not None:
+            settings[name] = cast(value)
+    return settings
@@ -0,0 +1,149 @@
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Tuple
+from fastapi.responses import JSONResponse
+
+# Route classes used to pick a bucket and an admission limit
+READ = "read"
+WRITE = "write"
+MUTATE = "mutate"
+
+DEFAULT_EXEMPT_PATHS = ("/", "/health", "/docs", "/redoc", "/openapi.json")
+
+
+class TokenBucket:
+    """Token bucket refilled lazily on each access"""
+
+    __slots__ = ("capacity", "refill_rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, refill_rate: float, now: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.updated = now
+
+    def consume(self, now: float) -> float:
+        """Take one token; return 0 on success or seconds until one is available"""
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        if self.refill_rate <= 0:
+            return 1.0
+        return (1 - self.tokens) / self.refill_rate
+
+
+def classify_request(method: str, path: str) -> str:
+    """Map a request onto a route class without touching the router"""
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return READ
+    if method == "POST" and "/books/" in path and path.rstrip("/").endswith(("/borrow", "/return")):
+        return WRITE
+    return MUTATE
+
+
+class RateLimitMiddleware:
+    """ASGI middleware combining per-client token buckets with a concurrency limit.
+
+    Each (client, route class) pair gets its own bucket, so a burst of searches
+    cannot use up the tokens for borrow/return. Admission control keeps
+    ``reserved_for_writes`` of the ``max_concurrent`` slots for borrow/return only.
+    """
+
+    def __init__(self, app, read_rate: float = 20.0, read_burst: int = 40,
+                 write_rate: float = 5.0, write_burst: int = 10,
+                 mutate_rate: float = 5.0, mutate_burst: int = 10,
+                 max_concurrent: int = 64, reserved_for_writes: int = 8,
+                 busy_retry_after: int = 1, max_clients: int = 10000,
+                 exempt_paths: Iterable[str] = DEFAULT_EXEMPT_PATHS):
+        if reserved_for_writes >= max_concurrent:
+            raise ValueError("reserved_for_writes must be lower than max_concurrent")
+        self.app = app
+        self._limits: Dict[str, Tuple[float, float]] = {
+            READ: (read_burst, read_rate),
+            WRITE: (write_burst, write_rate),
+            MUTATE: (mutate_burst, mutate_rate),
+        }
+        self._admission_limits: Dict[str, int] = {
+            READ: max_concurrent - reserved_for_writes,
+            WRITE: max_concurrent,
+            MUTATE: max_concurrent - reserved_for_writes,
+        }
+        self.busy_retry_after = busy_retry_after
+        self.max_clients = max_clients
+        self.exempt_paths = frozenset(exempt_paths)
+        self._buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self._in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify_request(scope["method"], scope["path"])
+
+        # Admission control first so rejected requests don't spend tokens
+        if self._in_flight >= self._admission_limits[route_class]:
+            response = self._reject(503, "Server is busy, please retry later", self.busy_retry_after)
+            await response(scope, receive, send)
+            return
+
+        now = time.monotonic()
+        wait = self._get_bucket(self._client_key(scope), route_class, now).consume(now)
+        if wait:
+            response = self._reject(429, "Rate limit exceeded", wait)
+            await response(scope, receive, send)
+            return
+
+        self._in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    def _get_bucket(self, client: str, route_class: str, now: float) -> TokenBucket:
+        """Fetch or create the bucket for a client, evicting the least recently seen"""
+        key = (client, route_class)
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            self._buckets.move_to_end(key)
+            return bucket
+
+        capacity, refill_rate = self._limits[route_class]
+        bucket = TokenBucket(capacity, refill_rate, now)
+        self._buckets[key] = bucket
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return bucket
+
+    @staticmethod
+    def _client_key(scope) -> str:
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    def _reject(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+        return JSONResponse(
+            status_code=status_code,
+            content={"detail": detail},
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+
+def rate_limit_settings_from_env() -> Dict[str, Any]:
+    """Read RateLimitMiddleware settings from RATE_LIMIT_* environment variables"""
+    settings: Dict[str, Any] = {}
+    for name, cast in (("read_rate", float), ("read_burst", int),
+                       ("write_rate", float), ("write_burst", int),
+                       ("mutate_rate", float), ("mutate_burst", int),
+                       ("max_concurrent", int), ("reserved_for_writes", int),
+                       ("busy_retry_after", int), ("max_clients", int)):
+        value = os.getenv(f"RATE_LIMIT_{name.upper()}")
+        if value is not None:
+            settings[name] = cast(value)
+    return settings
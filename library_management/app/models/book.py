@@ -46,6 +46,14 @@ class Book(BaseEntity):
             raise ValueError("Pages cannot be negative")
         self._pages = value
     
+    @property
+    def genre(self) -> Optional[str]:
+        return self._genre
+    
+    @genre.setter
+    def genre(self, value: Optional[str]):
+        self._genre = value.strip() if value else None
+    
     @property
     def status(self) -> BookStatus:
         return self._status
@@ -1,10 +1,12 @@
+from datetime import datetime
 from typing import Optional
 from .base import BaseEntity
-from ..services.library_service import LibraryService
 
 class Member(BaseEntity):
     """Member entity representing a library user"""
 
+    MAX_BORROWED_BOOKS = 5
+
     def __init__(self, name: str, email: str, membership_id: str, phone: Optional[str] = None):
         super().__init__(name)
         self._email: str = email
@@ -16,6 +18,13 @@ class Member(BaseEntity):
     def email(self) -> str:
         return self._email
 
+    @email.setter
+    def email(self, value: str):
+        if not value or "@" not in value:
+            raise ValueError("Invalid email address")
+        self._email = value.strip()
+        self._updated_at = datetime.now()
+
     @property
     def membership_id(self) -> str:
         return self._membership_id
@@ -24,17 +33,34 @@ class Member(BaseEntity):
     def phone(self) -> Optional[str]:
         return self._phone
 
+    @phone.setter
+    def phone(self, value: Optional[str]):
+        self._phone = value.strip() if value else None
+        self._updated_at = datetime.now()
+
     @property
     def borrowed_books(self) -> list[str]:
         return self._borrowed_books
 
-    def borrow_book(self, book_id: str):
-        if book_id not in self._borrowed_books:
-            self._borrowed_books.append(book_id)
+    @property
+    def can_borrow(self) -> bool:
+        return len(self._borrowed_books) < self.MAX_BORROWED_BOOKS
 
-    def return_book(self, book_id: str):
+    def borrow_book(self, book_id: str) -> bool:
+        """Record a borrowed book; False if it is already on the member's list"""
         if book_id in self._borrowed_books:
-            self._borrowed_books.remove(book_id)
+            return False
+        self._borrowed_books.append(book_id)
+        self._updated_at = datetime.now()
+        return True
+
+    def return_book(self, book_id: str) -> bool:
+        """Remove a returned book; False if the member did not have it"""
+        if book_id not in self._borrowed_books:
+            return False
+        self._borrowed_books.remove(book_id)
+        self._updated_at = datetime.now()
+        return True
 
     def to_dict(self) -> dict:
         return {
@@ -0,0 +1,44 @@
+import hmac
+import os
+from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi.responses import Response
+from typing import TYPE_CHECKING, List, Optional
+from ..dependencies import get_library_service
+from ..middleware.profiling import CPROFILE, profile_store
+from ..schemas.profiling_schemas import ProfileCaptureResponse
+from ..schemas.stats_schemas import CoalescingMetricsResponse
+
+if TYPE_CHECKING:
+    from ..services.library_service import LibraryService
+
+admin_router = APIRouter(prefix="/admin", tags=["admin"])
+
+def require_profiling_token(x_profile_token: Optional[str] = Header(None)):
+    """Profile endpoints are only reachable with the configured PROFILING_TOKEN"""
+    token = os.getenv("PROFILING_TOKEN")
+    if not token or not x_profile_token or not hmac.compare_digest(x_profile_token, token):
+        raise HTTPException(status_code=403, detail="Invalid or missing profiling token")
+
+@admin_router.get("/profiles", response_model=List[ProfileCaptureResponse],
+                  dependencies=[Depends(require_profiling_token)])
+async def list_profiles():
+    """List captured request profiles, newest first"""
+    return [ProfileCaptureResponse(**capture.to_dict()) for capture in profile_store.list()]
+
+@admin_router.get("/profiles/{capture_id}", dependencies=[Depends(require_profiling_token)])
+async def download_profile(capture_id: int):
+    """Download a capture as a pstats file or collapsed stacks for flame graphs"""
+    capture = profile_store.get(capture_id)
+    if not capture:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "application/octet-stream" if capture.mode == CPROFILE else "text/plain"
+    return Response(
+        content=capture.data,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{capture.filename}"'}
+    )
+
+@admin_router.get("/coalescing", response_model=CoalescingMetricsResponse)
+async def get_coalescing_metrics(service: "LibraryService" = Depends(get_library_service)):
+    """Get how many concurrent get/search reads shared an in-flight load"""
+    return CoalescingMetricsResponse(**service.get_read_coalescing_metrics())
@@ -1,17 +1,18 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from typing import TYPE_CHECKING, List
 from ..schemas.author_schemas import AuthorCreate, AuthorUpdate, AuthorResponse
-from ..services.library_service import LibraryService
+from ..dependencies import get_library_service
+from .streaming import stream_json_array
 
-authors_router = APIRouter(prefix="/authors", tags=["authors"])
+if TYPE_CHECKING:
+    from ..services.library_service import LibraryService
 
-def get_library_service():
-    return LibraryService()
+authors_router = APIRouter(prefix="/authors", tags=["authors"])
 
 @authors_router.post("/", response_model=AuthorResponse)
 async def create_author(
     author_data: AuthorCreate,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Create a new author"""
     try:
@@ -25,15 +26,14 @@ async def create_author(
         raise HTTPException(status_code=400, detail=str(e))
 
 @authors_router.get("/", response_model=List[AuthorResponse])
-async def get_all_authors(service: LibraryService = Depends(get_library_service)):
+async def get_all_authors(service: "LibraryService" = Depends(get_library_service)):
     """Get all authors"""
-    authors = service.get_all_authors()
-    return [AuthorResponse(**author.to_dict()) for author in authors]
+    return stream_json_array(service.iter_authors(), AuthorResponse)
 
 @authors_router.get("/{author_id}", response_model=AuthorResponse)
-async def get_author(
+def get_author(
     author_id: str,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Get author by ID"""
     author = service.get_author(author_id)
@@ -45,7 +45,7 @@ async def get_author(
 async def update_author(
     author_id: str,
     author_data: AuthorUpdate,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Update author information"""
     try:
@@ -60,7 +60,7 @@ async def update_author(
 @authors_router.delete("/{author_id}")
 async def delete_author(
     author_id: str,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Delete author"""
     try:
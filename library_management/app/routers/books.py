@@ -1,21 +1,21 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import List
-from ..schemas.book_schemas import BookCreate, BookUpdate, BookResponse, BorrowRequest
-from ..services.library_service import LibraryService
+from typing import TYPE_CHECKING, List, Optional
+from ..schemas.book_schemas import BookCreate, BookUpdate, BookResponse, BorrowRequest, BookStatus
+from ..dependencies import get_library_service
+from ..services.unique_index import DuplicateValueError
+
+if TYPE_CHECKING:
+    from ..services.library_service import LibraryService
 
 # Create router for book-related endpoints
 books_router = APIRouter(prefix="/books", tags=["books"])
 
-# Dependency to get LibraryService instance
-def get_library_service():
-    return LibraryService()
-
 
 # 1. Create a new book
 @books_router.post("/", response_model=BookResponse)
 async def create_book(
     book_data: BookCreate,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Create a new book"""
     try:
@@ -27,26 +27,66 @@ async def create_book(
             genre=book_data.genre
         )
         return BookResponse(**book.to_dict())
+    except DuplicateValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-# 2. Search books by title, author, or genre
+# 2. Filter books by status, genre, author, or page range
+@books_router.get("/", response_model=List[BookResponse])
+def filter_books(
+    status: Optional[BookStatus] = Query(None, description="Book status"),
+    genre: Optional[str] = Query(None, description="Exact genre"),
+    author_id: Optional[str] = Query(None, description="Author ID"),
+    min_pages: Optional[int] = Query(None, ge=0, description="Minimum page count"),
+    max_pages: Optional[int] = Query(None, ge=0, description="Maximum page count"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    service: "LibraryService" = Depends(get_library_service)
+):
+    """Filter books; all given predicates must match"""
+    books = service.filter_books(
+        status=status.value if status else None,
+        genre=genre,
+        author_id=author_id,
+        min_pages=min_pages,
+        max_pages=max_pages,
+        offset=offset,
+        limit=limit
+    )
+    return [BookResponse(**book) for book in books]
+
+
+# 3. Search books by title, author, or genre
 @books_router.get("/search", response_model=List[BookResponse])
-async def search_books(
+def search_books(
     q: str = Query(..., description="Search query"),
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Search books by title, author, or genre"""
     books = service.search_books(q)
     return [BookResponse(**book.to_dict()) for book in books]
 
 
-# 3. Get a book by ID
+# 4. Get a book by ISBN
+@books_router.get("/by-isbn/{isbn}", response_model=BookResponse)
+def get_book_by_isbn(
+    isbn: str,
+    service: "LibraryService" = Depends(get_library_service)
+):
+    """Get book by ISBN"""
+    book = service.get_book_by_isbn(isbn)
+    if not book:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return BookResponse(**book.to_dict())
+
+
+# 5. Get a book by ID
 @books_router.get("/{book_id}", response_model=BookResponse)
-async def get_book(
+def get_book(
     book_id: str,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Get book by ID"""
     book = service.get_book(book_id)
@@ -55,12 +95,12 @@ async def get_book(
     return BookResponse(**book.to_dict())
 
 
-# 4. Borrow a book
+# 6. Borrow a book
 @books_router.post("/{book_id}/borrow")
 async def borrow_book(
     book_id: str,
     borrow_data: BorrowRequest,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Borrow a book"""
     try:
@@ -72,12 +112,12 @@ async def borrow_book(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-# 5. Return a book
+# 7. Return a book
 @books_router.post("/{book_id}/return")
 async def return_book(
     book_id: str,
     return_data: BorrowRequest,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Return a borrowed book"""
     try:
@@ -89,12 +129,12 @@ async def return_book(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-# 6. Update book information
+# 8. Update book information
 @books_router.put("/{book_id}", response_model=BookResponse)
 async def update_book(
     book_id: str,
     book_data: BookUpdate,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Update book information"""
     try:
@@ -103,5 +143,7 @@ async def update_book(
         if not book:
             raise HTTPException(status_code=404, detail="Book not found")
         return BookResponse(**book.to_dict())
+    except DuplicateValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
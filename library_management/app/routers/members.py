@@ -1,39 +1,54 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from typing import TYPE_CHECKING, List
 from ..schemas.member_schemas import MemberCreate, MemberUpdate, MemberResponse
-from ..services.library_service import LibraryService
+from ..dependencies import get_library_service
+from ..services.unique_index import DuplicateValueError
+from .streaming import stream_json_array
 
-members_router = APIRouter(prefix="/members", tags=["members"])
+if TYPE_CHECKING:
+    from ..services.library_service import LibraryService
 
-def get_library_service():
-    return LibraryService()
+members_router = APIRouter(prefix="/members", tags=["members"])
 
 @members_router.post("/", response_model=MemberResponse)
 async def create_member(
     member_data: MemberCreate,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Create a new member"""
     try:
         member = service.create_member(
             name=member_data.name,
             email=member_data.email,
+            membership_id=member_data.membership_id,
             phone=member_data.phone
         )
         return MemberResponse(**member.to_dict())
+    except DuplicateValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @members_router.get("/", response_model=List[MemberResponse])
-async def get_all_members(service: LibraryService = Depends(get_library_service)):
+async def get_all_members(service: "LibraryService" = Depends(get_library_service)):
     """Get all members"""
-    members = service.get_all_members()
-    return [MemberResponse(**member.to_dict()) for member in members]
+    return stream_json_array(service.iter_members(), MemberResponse)
+
+@members_router.get("/by-email/{email}", response_model=MemberResponse)
+def get_member_by_email(
+    email: str,
+    service: "LibraryService" = Depends(get_library_service)
+):
+    """Get member by email address"""
+    member = service.get_member_by_email(email)
+    if not member:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return MemberResponse(**member.to_dict())
 
 @members_router.get("/{member_id}", response_model=MemberResponse)
-async def get_member(
+def get_member(
     member_id: str,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Get member by ID"""
     member = service.get_member(member_id)
@@ -45,7 +60,7 @@ async def get_member(
 async def update_member(
     member_id: str,
     member_data: MemberUpdate,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Update member information"""
     try:
@@ -54,13 +69,15 @@ async def update_member(
         if not member:
             raise HTTPException(status_code=404, detail="Member not found")
         return MemberResponse(**member.to_dict())
+    except DuplicateValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @members_router.delete("/{member_id}")
 async def delete_member(
     member_id: str,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Delete member"""
     try:
@@ -76,7 +93,7 @@ async def delete_member(
 @members_router.get("/{member_id}/borrowed-books", response_model=List[dict])
 async def get_member_borrowed_books(
     member_id: str,
-    service: LibraryService = Depends(get_library_service)
+    service: "LibraryService" = Depends(get_library_service)
 ):
     """Get books borrowed by a member"""
     try:
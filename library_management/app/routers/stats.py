@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, Query
+from typing import TYPE_CHECKING, List
+from ..schemas.stats_schemas import StatsResponse, BorrowedBookCount, MemberLoansResponse
+from ..dependencies import get_library_service
+from ..services.stats_store import TOP_BORROWED_LIMIT
+
+if TYPE_CHECKING:
+    from ..services.library_service import LibraryService
+
+stats_router = APIRouter(prefix="/stats", tags=["stats"])
+
+def _top_borrowed(stats: dict, limit: int) -> List[BorrowedBookCount]:
+    return [BorrowedBookCount(book_id=book_id, borrow_count=count)
+            for book_id, count in stats["top_borrowed"][:limit]]
+
+@stats_router.get("/", response_model=StatsResponse)
+async def get_stats(service: "LibraryService" = Depends(get_library_service)):
+    """Get catalog counts by status, genre, author and active loans per member"""
+    stats = service.get_stats()
+    return StatsResponse(
+        totals=stats["totals"],
+        books_by_status=stats["books_by_status"],
+        books_by_genre=stats["books_by_genre"],
+        books_by_author=stats["books_by_author"],
+        active_loans_by_member=stats["active_loans_by_member"],
+        top_borrowed=_top_borrowed(stats, TOP_BORROWED_LIMIT)
+    )
+
+@stats_router.get("/top-borrowed", response_model=List[BorrowedBookCount])
+async def get_top_borrowed(
+    limit: int = Query(TOP_BORROWED_LIMIT, ge=1, le=TOP_BORROWED_LIMIT),
+    service: "LibraryService" = Depends(get_library_service)
+):
+    """Get the most borrowed books"""
+    return _top_borrowed(service.get_stats(), limit)
+
+@stats_router.get("/members/{member_id}/active-loans", response_model=MemberLoansResponse)
+async def get_member_active_loans(
+    member_id: str,
+    service: "LibraryService" = Depends(get_library_service)
+):
+    """Get the number of books a member currently has on loan"""
+    stats = service.get_stats()
+    return MemberLoansResponse(
+        member_id=member_id,
+        active_loans=stats["active_loans_by_member"].get(member_id, 0)
+    )
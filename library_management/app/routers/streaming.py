@@ -0,0 +1,25 @@
+from typing import Any, Dict, Iterable, Iterator, Type
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+
+def iter_json_array(records: Iterable[Dict[str, Any]], model: Type[BaseModel],
+                    batch_size: int = 256) -> Iterator[bytes]:
+    """Serialize records as a JSON array, validating each through the response model"""
+    yield b"["
+    separator = ""
+    batch = []
+    for record in records:
+        batch.append(model(**record).model_dump_json())
+        if len(batch) >= batch_size:
+            yield (separator + ",".join(batch)).encode("utf-8")
+            separator = ","
+            batch = []
+    if batch:
+        yield (separator + ",".join(batch)).encode("utf-8")
+    yield b"]"
+
+
+def stream_json_array(records: Iterable[Dict[str, Any]], model: Type[BaseModel]) -> StreamingResponse:
+    """Build a streaming response for a list endpoint"""
+    return StreamingResponse(iter_json_array(records, model), media_type="application/json")
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class ProfileCaptureResponse(BaseModel):
+    id: int
+    mode: str
+    method: str
+    path: str
+    started_at: datetime
+    duration_ms: float
+    size_bytes: int
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import Dict, List
+
+class CatalogTotals(BaseModel):
+    authors: int
+    books: int
+    members: int
+
+class BorrowedBookCount(BaseModel):
+    book_id: str
+    borrow_count: int
+
+class StatsResponse(BaseModel):
+    totals: CatalogTotals
+    books_by_status: Dict[str, int]
+    books_by_genre: Dict[str, int]
+    books_by_author: Dict[str, int]
+    active_loans_by_member: Dict[str, int]
+    top_borrowed: List[BorrowedBookCount]
+
+class MemberLoansResponse(BaseModel):
+    member_id: str
+    active_loans: int
+
+class CoalescingMetricsResponse(BaseModel):
+    requests: int
+    executions: int
+    coalesced: int
+    in_flight: int
+    coalescing_ratio: float
@@ -0,0 +1,207 @@
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .data_storage import DataStorage
+
+COLLECTIONS = ("authors", "books", "members")
+
+# Level 9 (gzip's default) is several times slower for a few percent smaller files
+GZIP_LEVEL = 6
+
+
+def entity_hash(entity: Dict[str, Any]) -> str:
+    """Stable digest of an entity, used to detect changes between backups"""
+    encoded = json.dumps(entity, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def hash_entities(data: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    return {name: {entity_id: entity_hash(entity) for entity_id, entity in data[name].items()}
+            for name in COLLECTIONS}
+
+
+def content_digest(hashes: Dict[str, Dict[str, str]]) -> str:
+    """Digest of a whole dataset, independent of key order"""
+    digest = hashlib.sha256()
+    for name in COLLECTIONS:
+        for entity_id in sorted(hashes[name]):
+            digest.update(f"{name}/{entity_id}/{hashes[name][entity_id]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BackupManager:
+    """Full snapshots and incremental backups of the library data file.
+
+    DataStorage replaces the data file atomically, so a single read is a
+    consistent point-in-time snapshot and writers are never blocked. Incremental
+    backups hold only entities whose content hash changed since the previous
+    backup, plus the IDs of deleted entities.
+    """
+
+    def __init__(self, storage: "DataStorage", backup_dir: Optional[str] = None):
+        self.storage = storage
+        self.backup_dir = Path(backup_dir) if backup_dir else storage.data_file.parent / "backups"
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.backup_dir / "index.json"
+        self.state_file = self.backup_dir / "state.json.gz"
+
+    def list_backups(self) -> List[Dict[str, Any]]:
+        if not self.index_file.exists():
+            return []
+        with open(self.index_file, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Write a full backup of the current data"""
+        data = self.storage.load_data()
+        hashes = hash_entities(data)
+        payload = {name: data[name] for name in COLLECTIONS}
+        return self._write_backup("full", None, payload, {}, hashes)
+
+    def incremental(self) -> Dict[str, Any]:
+        """Write the entities changed since the last backup, or a full one if there is none"""
+        state = self._load_state()
+        if state is None:
+            return self.snapshot()
+
+        data = self.storage.load_data()
+        hashes = hash_entities(data)
+        changed: Dict[str, Dict[str, Any]] = {}
+        deleted: Dict[str, List[str]] = {}
+        for name in COLLECTIONS:
+            previous = state["hashes"][name]
+            changed[name] = {entity_id: data[name][entity_id]
+                             for entity_id, digest in hashes[name].items()
+                             if previous.get(entity_id) != digest}
+            deleted[name] = [entity_id for entity_id in previous if entity_id not in hashes[name]]
+        return self._write_backup("incremental", state["last_backup"], changed, deleted, hashes)
+
+    def restore(self, name: Optional[str] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """Rebuild data from a backup chain after verifying every checksum"""
+        backups = {entry["name"]: entry for entry in self.list_backups()}
+        if not backups:
+            raise ValueError("No backups available")
+        name = name or self.list_backups()[-1]["name"]
+        if name not in backups:
+            raise ValueError(f"Backup not found: {name}")
+
+        chain = []
+        entry = backups[name]
+        while True:
+            chain.append(entry)
+            if entry["type"] == "full":
+                break
+            if entry["base"] not in backups:
+                raise ValueError(f"Backup chain broken: {entry['base']} is missing")
+            entry = backups[entry["base"]]
+        chain.reverse()
+
+        for entry in chain:
+            if file_sha256(self.backup_dir / entry["name"]) != entry["sha256"]:
+                raise ValueError(f"Checksum mismatch for {entry['name']}")
+
+        data: Dict[str, Any] = {collection: {} for collection in COLLECTIONS}
+        for entry in chain:
+            with gzip.open(self.backup_dir / entry["name"], 'rt', encoding='utf-8') as file:
+                backup = json.load(file)
+            for collection in COLLECTIONS:
+                data[collection].update(backup["entities"][collection])
+                for entity_id in backup["deleted"].get(collection, []):
+                    data[collection].pop(entity_id, None)
+
+        if content_digest(hash_entities(data)) != chain[-1]["content_digest"]:
+            raise ValueError(f"Restored data does not match {name}")
+
+        if not dry_run:
+            current = self.storage.load_data()
+            # Keep any non-entity sections of the file
+            current.update(data)
+            self.storage.save_data(current)
+            from .stats_store import StatsStore
+            StatsStore(self.storage).rebuild()
+        return chain[-1]
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        if not self.state_file.exists():
+            return None
+        with gzip.open(self.state_file, 'rt', encoding='utf-8') as file:
+            return json.load(file)
+
+    def _write_backup(self, backup_type: str, base: Optional[str], entities: Dict[str, Any],
+                      deleted: Dict[str, List[str]], hashes: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+        created_at = datetime.now()
+        name = f"{created_at:%Y%m%dT%H%M%S%f}-{backup_type}.json.gz"
+        path = self.backup_dir / name
+        payload = json.dumps({"type": backup_type, "base": base, "entities": entities, "deleted": deleted})
+        with gzip.open(path, 'wt', encoding='utf-8', compresslevel=GZIP_LEVEL) as file:
+            file.write(payload)
+
+        entry = {
+            "name": name,
+            "type": backup_type,
+            "base": base,
+            "created_at": created_at.isoformat(),
+            "sha256": file_sha256(path),
+            "content_digest": content_digest(hashes),
+            "changed": sum(len(items) for items in entities.values()),
+            "deleted": sum(len(ids) for ids in deleted.values()),
+        }
+        self._write_json(self.index_file, self.list_backups() + [entry])
+
+        temp_state = self.state_file.with_suffix(".tmp")
+        with gzip.open(temp_state, 'wt', encoding='utf-8', compresslevel=GZIP_LEVEL) as file:
+            file.write(json.dumps({"last_backup": name, "hashes": hashes}))
+        temp_state.replace(self.state_file)
+        return entry
+
+    @staticmethod
+    def _write_json(path: Path, value: Any):
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(value, file, indent=4)
+        temp_path.replace(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back up or restore library data")
+    parser.add_argument("command", choices=["snapshot", "incremental", "restore", "verify", "list"])
+    parser.add_argument("name", nargs="?", help="backup to restore or verify (default: latest)")
+    parser.add_argument("--data-file", default="data/library_data.json")
+    parser.add_argument("--backup-dir")
+    args = parser.parse_args()
+
+    from .data_storage import DataStorage
+    manager = BackupManager(DataStorage(args.data_file), args.backup_dir)
+    try:
+        if args.command == "list":
+            for entry in manager.list_backups():
+                print(f"{entry['name']}  {entry['type']:<11}  changed={entry['changed']} deleted={entry['deleted']}")
+        elif args.command in ("snapshot", "incremental"):
+            entry = getattr(manager, args.command)()
+            print(f"Wrote {entry['name']} ({entry['changed']} changed, {entry['deleted']} deleted)")
+        else:
+            entry = manager.restore(args.name, dry_run=args.command == "verify")
+            action = "Verified" if args.command == "verify" else "Restored"
+            print(f"{action} {entry['name']}")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import re
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+from ..models.book import BookStatus
+
+# Pages are bucketed so a range query ORs whole-bucket bitmaps and only
+# checks the rows in the two edge buckets individually
+PAGE_BUCKET_SIZE = 10
+
+STATUS_CODES = {status.value: code for code, status in enumerate(BookStatus)}
+STATUS_VALUES = [status.value for status in BookStatus]
+
+_NONZERO_BYTE = re.compile(b"[^\x00]")
+
+
+class _Bitmap:
+    """Mutable row bitmap; converted to an int so predicates combine with C-level & and |"""
+
+    __slots__ = ("bits",)
+
+    def __init__(self, size: int = 0):
+        self.bits = bytearray((size + 7) // 8)
+
+    def set(self, row: int):
+        index = row >> 3
+        if index >= len(self.bits):
+            self.bits.extend(bytes(index + 1 - len(self.bits)))
+        self.bits[index] |= 1 << (row & 7)
+
+    def clear(self, row: int):
+        index = row >> 3
+        if index < len(self.bits):
+            self.bits[index] &= ~(1 << (row & 7)) & 0xFF
+
+    def to_int(self) -> int:
+        return int.from_bytes(self.bits, "little")
+
+
+def _rows_from_int(mask: int, size: int) -> Iterable[int]:
+    """Yield set rows in ascending order, skipping empty bytes with a regex scan"""
+    if not mask:
+        return
+    data = mask.to_bytes((size + 7) // 8, "little")
+    for match in _NONZERO_BYTE.finditer(data):
+        index = match.start()
+        byte = data[index]
+        base = index << 3
+        for bit in range(8):
+            if byte & (1 << bit):
+                yield base + bit
+
+
+class ColumnarBookCatalog:
+    """Array-backed copy of the book collection for fast multi-predicate filtering.
+
+    Each field is a column indexed by row. Status, genre and author are stored
+    as small integer codes (genres and author IDs are interned). Status, genre
+    and page-bucket bitmaps answer equality and range predicates; author uses
+    per-author row lists since there can be many authors.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.titles: List[str] = []
+        self.isbns: List[str] = []
+        self.borrowed_by: List[Optional[str]] = []
+        self.borrowed_date: List[Optional[str]] = []
+        self.created_at: List[Optional[str]] = []
+        self.updated_at: List[Optional[str]] = []
+        self.pages = array("l")
+        self.status = array("b")
+        self.genre = array("l")
+        self.author = array("l")
+
+        self.genre_values: List[str] = []
+        self.genre_codes: Dict[str, int] = {}
+        self.author_values: List[str] = []
+        self.author_codes: Dict[str, int] = {}
+
+        self.status_bitmaps = [_Bitmap() for _ in STATUS_VALUES]
+        self.genre_bitmaps: List[_Bitmap] = []
+        self.page_bitmaps: Dict[int, _Bitmap] = {}
+        self.author_rows: List[List[int]] = []
+
+    @classmethod
+    def from_books(cls, books: Iterable[Dict[str, Any]]) -> "ColumnarBookCatalog":
+        catalog = cls()
+        for book in books:
+            catalog.upsert(book)
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _intern_genre(self, genre: Optional[str]) -> int:
+        if genre is None:
+            return -1
+        code = self.genre_codes.get(genre)
+        if code is None:
+            code = self.genre_codes[genre] = len(self.genre_values)
+            self.genre_values.append(genre)
+            self.genre_bitmaps.append(_Bitmap(len(self.ids)))
+        return code
+
+    def _intern_author(self, author_id: str) -> int:
+        code = self.author_codes.get(author_id)
+        if code is None:
+            code = self.author_codes[author_id] = len(self.author_values)
+            self.author_values.append(author_id)
+            self.author_rows.append([])
+        return code
+
+    def _page_bitmap(self, bucket: int) -> _Bitmap:
+        bitmap = self.page_bitmaps.get(bucket)
+        if bitmap is None:
+            bitmap = self.page_bitmaps[bucket] = _Bitmap(len(self.ids))
+        return bitmap
+
+    def upsert(self, book: Dict[str, Any]):
+        """Add a book or bring an existing row in line with the stored record"""
+        row = self.rows.get(book["id"])
+        if row is None:
+            row = self.rows[book["id"]] = len(self.ids)
+            self.ids.append(book["id"])
+            for column in (self.titles, self.isbns, self.borrowed_by, self.borrowed_date,
+                           self.created_at, self.updated_at):
+                column.append(None)
+            self.pages.append(0)
+            self.status.append(-1)
+            self.genre.append(-1)
+            self.author.append(-1)
+        else:
+            self._clear_indexes(row)
+
+        self.titles[row] = book["title"]
+        self.isbns[row] = book["isbn"]
+        self.borrowed_by[row] = book.get("borrowed_by")
+        self.borrowed_date[row] = book.get("borrowed_date")
+        self.created_at[row] = book.get("created_at")
+        self.updated_at[row] = book.get("updated_at")
+        self.pages[row] = book.get("pages", 0)
+        self.status[row] = STATUS_CODES[book["status"]]
+        self.genre[row] = self._intern_genre(book.get("genre"))
+        self.author[row] = self._intern_author(book["author_id"])
+
+        self.status_bitmaps[self.status[row]].set(row)
+        if self.genre[row] >= 0:
+            self.genre_bitmaps[self.genre[row]].set(row)
+        self._page_bitmap(self.pages[row] // PAGE_BUCKET_SIZE).set(row)
+        self.author_rows[self.author[row]].append(row)
+
+    def _clear_indexes(self, row: int):
+        self.status_bitmaps[self.status[row]].clear(row)
+        if self.genre[row] >= 0:
+            self.genre_bitmaps[self.genre[row]].clear(row)
+        self.page_bitmaps[self.pages[row] // PAGE_BUCKET_SIZE].clear(row)
+        self.author_rows[self.author[row]].remove(row)
+
+    def filter(self, status: Optional[str] = None, genre: Optional[str] = None,
+               author_id: Optional[str] = None, min_pages: Optional[int] = None,
+               max_pages: Optional[int] = None, offset: int = 0,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return book records matching every given predicate, in insertion order"""
+        size = len(self.ids)
+        mask = (1 << size) - 1
+
+        if status is not None:
+            if status not in STATUS_CODES:
+                return []
+            mask &= self.status_bitmaps[STATUS_CODES[status]].to_int()
+        if genre is not None and mask:
+            code = self.genre_codes.get(genre)
+            if code is None:
+                return []
+            mask &= self.genre_bitmaps[code].to_int()
+        if author_id is not None and mask:
+            code = self.author_codes.get(author_id)
+            if code is None:
+                return []
+            author_bitmap = _Bitmap(size)
+            for row in self.author_rows[code]:
+                author_bitmap.set(row)
+            mask &= author_bitmap.to_int()
+        if (min_pages is not None or max_pages is not None) and mask:
+            mask &= self._page_range_mask(min_pages, max_pages, mask)
+
+        results = []
+        for index, row in enumerate(_rows_from_int(mask, size)):
+            if index < offset:
+                continue
+            if limit is not None and len(results) >= limit:
+                break
+            results.append(self.to_dict(row))
+        return results
+
+    def _page_range_mask(self, min_pages: Optional[int], max_pages: Optional[int],
+                         candidates: int) -> int:
+        low = min_pages if min_pages is not None else 0
+        high = max_pages if max_pages is not None else None
+        low_bucket = low // PAGE_BUCKET_SIZE
+        high_bucket = high // PAGE_BUCKET_SIZE if high is not None else None
+
+        mask = 0
+        edge_rows = _Bitmap(len(self.ids))
+        for bucket, bitmap in self.page_bitmaps.items():
+            if bucket < low_bucket or (high_bucket is not None and bucket > high_bucket):
+                continue
+            if low_bucket < bucket and (high_bucket is None or bucket < high_bucket):
+                mask |= bitmap.to_int()
+                continue
+            # Edge bucket: check only rows still matching the other predicates
+            for row in _rows_from_int(bitmap.to_int() & candidates, len(self.ids)):
+                pages = self.pages[row]
+                if pages >= low and (high is None or pages <= high):
+                    edge_rows.set(row)
+        return mask | edge_rows.to_int()
+
+    def to_dict(self, row: int) -> Dict[str, Any]:
+        genre = self.genre[row]
+        return {
+            "id": self.ids[row],
+            "title": self.titles[row],
+            "author_id": self.author_values[self.author[row]],
+            "isbn": self.isbns[row],
+            "pages": self.pages[row],
+            "genre": self.genre_values[genre] if genre >= 0 else None,
+            "status": STATUS_VALUES[self.status[row]],
+            "borrowed_by": self.borrowed_by[row],
+            "borrowed_date": self.borrowed_date[row],
+            "created_at": self.created_at[row],
+            "updated_at": self.updated_at[row],
+        }
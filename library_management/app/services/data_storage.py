@@ -1,8 +1,136 @@
 import json
+import os
+import re
+import threading
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, IO, Optional
 from fastapi import HTTPException
 
+_decoder = json.JSONDecoder()
+
+# Everything up to the next bracket outside a string: plain text runs and whole strings
+_SKIP_RUN = re.compile(r'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+_NON_BRACKET_BYTES = bytes(byte for byte in range(256) if byte not in b"{}[]")
+_BRACKET_STEP = {ord("{"): 1, ord("["): 1, ord("}"): -1, ord("]"): -1}
+
+
+class _JSONStreamReader:
+    """Incremental reader that decodes one JSON value at a time from a file"""
+
+    def __init__(self, file: IO[str], chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Invalid JSON data: unexpected end of file")
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Invalid JSON data: expected '{char}' at offset {self._pos}")
+        self._pos += 1
+
+    def decode(self) -> Any:
+        """Decode the next complete value, reading more of the file as needed"""
+        self.peek()
+        while True:
+            try:
+                value, self._pos = _decoder.raw_decode(self._buffer, self._pos)
+                return value
+            except json.JSONDecodeError as e:
+                if not self._fill():
+                    raise ValueError(f"Invalid JSON data: {e}")
+
+    def skip(self):
+        """Consume the next value without decoding it.
+
+        Containers are skipped a buffer at a time: the buffer is split on
+        quotes, string contents are dropped and the brackets left over are
+        counted. A buffer where that isn't safe (it holds an escaped quote, or
+        the value closes inside it) is walked bracket by bracket instead.
+        """
+        if self.peek() not in "{[":
+            self.decode()
+            return
+        depth = 0
+        while True:
+            skipped = self._skip_buffer(depth)
+            if skipped is not None:
+                depth = skipped
+            else:
+                depth = self._walk_brackets(depth)
+                if depth == 0:
+                    return
+            if not self._fill():
+                raise ValueError("Invalid JSON data: unexpected end of file")
+
+    def _skip_buffer(self, depth: int) -> Optional[int]:
+        """Consume the buffer up to its last string boundary if the value stays open throughout"""
+        window = self._buffer[self._pos:]
+        if '\\"' in window:
+            return None
+        # Stop before an unterminated string so the split stays aligned
+        end = len(window) if window.count('"') % 2 == 0 else window.rfind('"')
+        if end <= 0:
+            return None
+        # Outside-string text is every other piece between quotes; bytes ops keep it in C
+        outside = b"".join(window[:end].encode("utf-8").split(b'"')[0::2])
+        brackets = outside.translate(None, _NON_BRACKET_BYTES)
+        if brackets:
+            levels = list(accumulate(map(_BRACKET_STEP.__getitem__, brackets)))
+            if depth + min(levels) <= 0:
+                return None
+            depth += levels[-1]
+        self._pos += end
+        return depth
+
+    def _walk_brackets(self, depth: int) -> int:
+        """Track depth through the buffer; returns 0 once the value closes"""
+        while True:
+            self._pos = _SKIP_RUN.match(self._buffer, self._pos).end()
+            if self._pos == len(self._buffer) or self._buffer[self._pos] == '"':
+                # Out of buffer, possibly part-way through a string
+                return depth
+            char = self._buffer[self._pos]
+            self._pos += 1
+            depth += 1 if char in "{[" else -1
+            if depth == 0:
+                return 0
+
+    def iter_keys(self) -> Iterator[str]:
+        """Walk an object, yielding each key; the caller must consume its value"""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.decode()
+            self.expect(":")
+            yield key
+            separator = self.peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Invalid JSON data: unexpected '{separator}'")
+
 class DataStorage:
     """File-based storage service demonstrating file I/O and error handling"""
 
@@ -34,10 +162,29 @@ class DataStorage:
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
+    def iter_collection(self, collection: str, chunk_size: int = 64 * 1024) -> Iterator[Dict[str, Any]]:
+        """Yield entities of one collection while parsing the file incrementally"""
+        try:
+            with open(self.data_file, 'r', encoding='utf-8') as file:
+                reader = _JSONStreamReader(file, chunk_size)
+                for name in reader.iter_keys():
+                    if name != collection:
+                        # Collections before the target are skipped, not decoded
+                        reader.skip()
+                        continue
+                    for _ in reader.iter_keys():
+                        yield reader.decode()
+                    return
+        except FileNotFoundError:
+            self._ensure_data_file()
+
     def save_data(self, data: Dict[str, Any]):
-        """Save data to JSON file"""
+        """Save data to JSON file atomically, so readers always see a complete version"""
+        temp_file = self.data_file.with_name(f".{self.data_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as file:
+            with open(temp_file, 'w', encoding='utf-8') as file:
                 json.dump(data, file, indent=4)
+            os.replace(temp_file, self.data_file)
         except Exception as e:
+            temp_file.unlink(missing_ok=True)
             raise HTTPException(status_code=500, detail=f"Failed to save data: {e}")
@@ -1,14 +1,129 @@
-from typing import List, Optional, Dict, Any
+import logging
+import threading
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Callable, Iterator
 from ..models.author import Author
 from ..models.book import Book, BookStatus
 from ..models.member import Member
-from .data_storage import DataStorage
+from .stats_store import StatsStore
+from .single_flight import SingleFlight
+from .book_catalog import ColumnarBookCatalog
+from .unique_index import LibraryIndexes
+
+if TYPE_CHECKING:
+    from .data_storage import DataStorage
+
+logger = logging.getLogger(__name__)
 
 class LibraryService:
     """Main business logic service demonstrating composition and error handling"""
     
-    def __init__(self):
-        self.storage = DataStorage()
+    def __init__(self, storage: Optional["DataStorage"] = None):
+        self._storage: Optional["DataStorage"] = None
+        self._stats: Optional[StatsStore] = None
+        self._storage_lock = threading.Lock()
+        # Concurrent identical reads share one load of the data file; keys carry
+        # the write generation so a read never joins a load older than a local write
+        self._reads = SingleFlight()
+        self._generation = 0
+        # Columnar copy of the books, built on the first filter request
+        self._catalog: Optional[ColumnarBookCatalog] = None
+        self._catalog_mtime: Optional[int] = None
+        self._catalog_lock = threading.Lock()
+        # Unique email / membership ID / ISBN indexes, built on first use
+        self._indexes: Optional[LibraryIndexes] = None
+        self._indexes_mtime: Optional[int] = None
+        self._indexes_lock = threading.Lock()
+        if storage is not None:
+            self._attach_storage(storage)
+    
+    def _attach_storage(self, storage: "DataStorage"):
+        # Created together so counters are bootstrapped before the first mutation;
+        # storage is set last so a thread that sees it also sees the stats store
+        self._stats = StatsStore(storage)
+        self._storage = storage
+    
+    def _ensure_storage(self) -> "DataStorage":
+        """Load the storage backend on first use, once even under concurrent first requests"""
+        if self._storage is None:
+            with self._storage_lock:
+                if self._storage is None:
+                    from ..dependencies import load_storage_backend
+                    self._attach_storage(load_storage_backend())
+        return self._storage
+    
+    @property
+    def storage(self) -> "DataStorage":
+        """Storage backend, loaded on first use"""
+        return self._ensure_storage()
+    
+    @property
+    def stats(self) -> StatsStore:
+        self._ensure_storage()
+        return self._stats
+    
+    def _save(self, data: Dict[str, Any]):
+        """Save the data file and carry the catalog and indexes over to the new version.
+
+        The service's own writes keep them current through _sync_catalog and
+        _sync_indexes, so only a change by another process since the last
+        build (the file's mtime moved before this save) leaves them stale.
+        """
+        with self._catalog_lock, self._indexes_lock:
+            before = self.storage.data_file.stat().st_mtime_ns
+            self.storage.save_data(data)
+            self._generation += 1
+            after = self.storage.data_file.stat().st_mtime_ns
+            if self._catalog is not None and self._catalog_mtime == before:
+                self._catalog_mtime = after
+            if self._indexes is not None and self._indexes_mtime == before:
+                self._indexes_mtime = after
+
+    def _coalesced_read(self, key: tuple, load: Callable[..., Any], *args) -> Any:
+        """Run a read through the single-flight group for this write generation"""
+        return self._reads.do(key + (self._generation,), load, *args)
+
+    def _record_stats(self, record: Callable[..., None], *args):
+        """Apply a stats update for a change that is already saved.
+
+        A failure is logged rather than raised: the entity exists, so reporting
+        the request as failed would only invite a duplicate retry. The counters
+        stay stale until ``python -m app.services.stats_store rebuild``.
+        """
+        try:
+            record(*args)
+        except Exception:
+            logger.exception("Failed to update library stats")
+
+    def _unique_indexes(self) -> LibraryIndexes:
+        """Unique indexes, rebuilt when the data file was changed by another process.
+
+        As with the book catalog, the rebuild runs outside the lock so writes
+        aren't held up by it, and is kept only if no write landed meanwhile.
+        """
+        with self._indexes_lock:
+            mtime = self.storage.data_file.stat().st_mtime_ns
+            if self._indexes is not None and mtime == self._indexes_mtime:
+                return self._indexes
+
+        indexes = self._reads.do(("indexes", mtime), self._build_indexes)
+        with self._indexes_lock:
+            if self.storage.data_file.stat().st_mtime_ns == mtime:
+                self._indexes = indexes
+                self._indexes_mtime = mtime
+            return indexes
+
+    def _build_indexes(self) -> LibraryIndexes:
+        data = self.storage.load_data()
+        indexes = LibraryIndexes()
+        indexes.build(data["members"].values(), data["books"].values())
+        return indexes
+    
+    def _sync_indexes(self, entity_id: str, changes: Dict[str, tuple]):
+        """Apply (old, new) value changes for a saved entity to the unique indexes"""
+        with self._indexes_lock:
+            if self._indexes is not None:
+                for name, (old_value, new_value) in changes.items():
+                    getattr(self._indexes, name).update(entity_id, old_value, new_value)
     
     # Author operations
     def create_author(self, name: str, biography: Optional[str] = None, 
@@ -18,13 +133,17 @@ class LibraryService:
             author = Author(name, biography, birth_year)
             data = self.storage.load_data()
             data["authors"][author.id] = author.to_dict()
-            self.storage.save_data(data)
-            return author
+            self._save(data)
         except Exception as e:
             raise RuntimeError(f"Failed to create author: {e}")
+        self._record_stats(self.stats.record_author_created)
+        return author
     
     def get_author(self, author_id: str) -> Optional[Author]:
         """Get author by ID"""
+        return self._coalesced_read(("author", author_id), self._load_author, author_id)
+    
+    def _load_author(self, author_id: str) -> Optional[Author]:
         data = self.storage.load_data()
         author_data = data["authors"].get(author_id)
         if author_data:
@@ -45,9 +164,13 @@ class LibraryService:
             authors.append(author)
         return authors
     
+    def iter_authors(self) -> Iterator[Dict[str, Any]]:
+        """Yield stored author records one at a time"""
+        return self.storage.iter_collection("authors")
+    
     def update_author(self, author_id: str, **kwargs) -> Optional[Author]:
         """Update author information"""
-        author = self.get_author(author_id)
+        author = self._load_author(author_id)
         if not author:
             return None
         
@@ -61,7 +184,7 @@ class LibraryService:
             
             data = self.storage.load_data()
             data["authors"][author_id] = author.to_dict()
-            self.storage.save_data(data)
+            self._save(data)
             return author
         except Exception as e:
             raise RuntimeError(f"Failed to update author: {e}")
@@ -79,7 +202,8 @@ class LibraryService:
             raise ValueError("Cannot delete author with associated books")
         
         del data["authors"][author_id]
-        self.storage.save_data(data)
+        self._save(data)
+        self._record_stats(self.stats.record_author_deleted)
         return True
     
     # Book operations
@@ -87,8 +211,9 @@ class LibraryService:
                    pages: int = 0, genre: Optional[str] = None) -> Book:
         """Create a new book"""
         # Verify author exists
-        if not self.get_author(author_id):
+        if not self._load_author(author_id):
             raise ValueError("Author not found")
+        self._unique_indexes().isbn.check(isbn)
         
         try:
             book = Book(title, author_id, isbn, pages, genre)
@@ -98,13 +223,19 @@ class LibraryService:
             # Update author's book list
             data["authors"][author_id]["books"].append(book.id)
             
-            self.storage.save_data(data)
-            return book
+            self._save(data)
+            self._sync_catalog(data["books"][book.id])
+            self._sync_indexes(book.id, {"isbn": (None, book.isbn)})
         except Exception as e:
             raise RuntimeError(f"Failed to create book: {e}")
+        self._record_stats(self.stats.record_book_created, data["books"][book.id])
+        return book
     
     def get_book(self, book_id: str) -> Optional[Book]:
         """Get book by ID"""
+        return self._coalesced_read(("book", book_id), self._load_book, book_id)
+    
+    def _load_book(self, book_id: str) -> Optional[Book]:
         data = self.storage.load_data()
         book_data = data["books"].get(book_id)
         if book_data:
@@ -117,8 +248,45 @@ class LibraryService:
             return book
         return None
     
+    def get_book_by_isbn(self, isbn: str) -> Optional[Book]:
+        """Get book by ISBN using the unique index"""
+        book_id = self._unique_indexes().isbn.owner(isbn)
+        return self.get_book(book_id) if book_id else None
+    
+    def update_book(self, book_id: str, **kwargs) -> Optional[Book]:
+        """Update book information"""
+        book = self._load_book(book_id)
+        if not book:
+            return None
+        if "isbn" in kwargs:
+            self._unique_indexes().isbn.check(kwargs["isbn"], book_id)
+        
+        old_isbn, old_genre = book.isbn, book.genre
+        try:
+            if "title" in kwargs:
+                book.name = kwargs["title"]
+            if "isbn" in kwargs:
+                book.isbn = kwargs["isbn"]
+            if "pages" in kwargs:
+                book.pages = kwargs["pages"]
+            if "genre" in kwargs:
+                book.genre = kwargs["genre"]
+            
+            data = self.storage.load_data()
+            data["books"][book_id] = book.to_dict()
+            self._save(data)
+            self._sync_catalog(data["books"][book_id])
+            self._sync_indexes(book_id, {"isbn": (old_isbn, book.isbn)})
+        except Exception as e:
+            raise RuntimeError(f"Failed to update book: {e}")
+        self._record_stats(self.stats.record_book_genre_changed, old_genre, book.genre)
+        return book
+    
     def search_books(self, query: str) -> List[Book]:
         """Search books by title, author name, or genre"""
+        return self._coalesced_read(("search", query.lower()), self._search_books, query)
+    
+    def _search_books(self, query: str) -> List[Book]:
         data = self.storage.load_data()
         results = []
         query = query.lower()
@@ -142,6 +310,38 @@ class LibraryService:
         
         return results
     
+    def filter_books(self, status: Optional[str] = None, genre: Optional[str] = None,
+                     author_id: Optional[str] = None, min_pages: Optional[int] = None,
+                     max_pages: Optional[int] = None, offset: int = 0,
+                     limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Filter books on the columnar catalog; returns stored book records"""
+        with self._catalog_lock:
+            mtime = self.storage.data_file.stat().st_mtime_ns
+            if self._catalog is not None and mtime == self._catalog_mtime:
+                return self._catalog.filter(status, genre, author_id, min_pages, max_pages,
+                                            offset, limit)
+
+        # First use, or the file was changed by another process. The build runs
+        # outside the lock so writers and other filters aren't held up by it, and
+        # concurrent callers share one build of the same file version.
+        catalog = self._reads.do(("catalog", mtime), self._build_catalog)
+        with self._catalog_lock:
+            # Keep it only if no write landed during the build; either way it is
+            # a consistent snapshot from when this call started
+            if self.storage.data_file.stat().st_mtime_ns == mtime:
+                self._catalog = catalog
+                self._catalog_mtime = mtime
+            return catalog.filter(status, genre, author_id, min_pages, max_pages, offset, limit)
+
+    def _build_catalog(self) -> ColumnarBookCatalog:
+        return ColumnarBookCatalog.from_books(self.storage.iter_collection("books"))
+    
+    def _sync_catalog(self, book_data: Dict[str, Any]):
+        """Apply a saved book to the columnar catalog, if it has been built"""
+        with self._catalog_lock:
+            if self._catalog is not None:
+                self._catalog.upsert(book_data)
+    
     def _dict_to_book(self, book_data: Dict) -> Book:
         """Helper method to convert dict to Book object"""
         book = Book(book_data["title"], book_data["author_id"], 
@@ -153,34 +353,79 @@ class LibraryService:
         return book
     
     # Member operations
-    def create_member(self, name: str, email: str, phone: Optional[str] = None) -> Member:
+    def create_member(self, name: str, email: str, membership_id: str,
+                      phone: Optional[str] = None) -> Member:
         """Create a new member"""
+        indexes = self._unique_indexes()
+        indexes.email.check(email)
+        indexes.membership_id.check(membership_id)
+        
         try:
-            member = Member(name, email, phone)
+            member = Member(name, email, membership_id, phone)
             data = self.storage.load_data()
             data["members"][member.id] = member.to_dict()
-            self.storage.save_data(data)
-            return member
+            self._save(data)
+            self._sync_indexes(member.id, {"email": (None, email),
+                                           "membership_id": (None, membership_id)})
         except Exception as e:
             raise RuntimeError(f"Failed to create member: {e}")
+        self._record_stats(self.stats.record_member_created)
+        return member
     
     def get_member(self, member_id: str) -> Optional[Member]:
         """Get member by ID"""
+        return self._coalesced_read(("member", member_id), self._load_member, member_id)
+    
+    def _load_member(self, member_id: str) -> Optional[Member]:
         data = self.storage.load_data()
         member_data = data["members"].get(member_id)
         if member_data:
-            member = Member(member_data["name"], member_data["email"], 
-                          member_data.get("phone"))
+            member = Member(member_data["name"], member_data["email"],
+                          member_data.get("membership_id", ""), member_data.get("phone"))
             member._id = member_data["id"]
             member._borrowed_books = member_data.get("borrowed_books", [])
             return member
         return None
     
+    def get_member_by_email(self, email: str) -> Optional[Member]:
+        """Get member by email using the unique index"""
+        member_id = self._unique_indexes().email.owner(email)
+        return self.get_member(member_id) if member_id else None
+    
+    def update_member(self, member_id: str, **kwargs) -> Optional[Member]:
+        """Update member information"""
+        member = self._load_member(member_id)
+        if not member:
+            return None
+        if "email" in kwargs:
+            self._unique_indexes().email.check(kwargs["email"], member_id)
+        
+        old_email = member.email
+        try:
+            if "name" in kwargs:
+                member.name = kwargs["name"]
+            if "email" in kwargs:
+                member.email = kwargs["email"]
+            if "phone" in kwargs:
+                member.phone = kwargs["phone"]
+            
+            data = self.storage.load_data()
+            data["members"][member_id] = member.to_dict()
+            self._save(data)
+            self._sync_indexes(member_id, {"email": (old_email, member.email)})
+            return member
+        except Exception as e:
+            raise RuntimeError(f"Failed to update member: {e}")
+    
+    def iter_members(self) -> Iterator[Dict[str, Any]]:
+        """Yield stored member records one at a time"""
+        return self.storage.iter_collection("members")
+    
     # Borrowing operations
     def borrow_book(self, book_id: str, member_id: str) -> bool:
         """Handle book borrowing transaction"""
-        book = self.get_book(book_id)
-        member = self.get_member(member_id)
+        book = self._load_book(book_id)
+        member = self._load_member(member_id)
         
         if not book or not member:
             raise ValueError("Book or member not found")
@@ -196,15 +441,17 @@ class LibraryService:
             data = self.storage.load_data()
             data["books"][book_id] = book.to_dict()
             data["members"][member_id] = member.to_dict()
-            self.storage.save_data(data)
+            self._save(data)
+            self._sync_catalog(data["books"][book_id])
+            self._record_stats(self.stats.record_book_borrowed, book_id, member_id)
             return True
         
         return False
     
     def return_book(self, book_id: str, member_id: str) -> bool:
         """Handle book return transaction"""
-        book = self.get_book(book_id)
-        member = self.get_member(member_id)
+        book = self._load_book(book_id)
+        member = self._load_member(member_id)
         
         if not book or not member:
             raise ValueError("Book or member not found")
@@ -217,7 +464,18 @@ class LibraryService:
             data = self.storage.load_data()
             data["books"][book_id] = book.to_dict()
             data["members"][member_id] = member.to_dict()
-            self.storage.save_data(data)
+            self._save(data)
+            self._sync_catalog(data["books"][book_id])
+            self._record_stats(self.stats.record_book_returned, member_id)
             return True
         
         return False
+    
+    # Statistics
+    def get_stats(self) -> Dict[str, Any]:
+        """Get incrementally maintained catalog counters"""
+        return self.stats.load()
+    
+    def get_read_coalescing_metrics(self) -> Dict[str, Any]:
+        """Get single-flight counters for get_* and search reads"""
+        return self._reads.metrics()
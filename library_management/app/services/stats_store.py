@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+
+try:
+    import fcntl
+except ImportError:  # Windows: updates are only serialised within one process
+    fcntl = None
+
+if TYPE_CHECKING:
+    from .data_storage import DataStorage
+
+TOP_BORROWED_LIMIT = 10
+
+# Counters derived from the catalog; borrow_counts is history and can't be recomputed
+DERIVED_KEYS = ("totals", "books_by_status", "books_by_genre", "books_by_author",
+                "active_loans_by_member")
+
+# Process-wide cache of parsed stats files: path -> (mtime_ns, stats)
+_cache: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+_update_lock = threading.Lock()
+
+
+def empty_stats() -> Dict[str, Any]:
+    return {
+        "totals": {"authors": 0, "books": 0, "members": 0},
+        "books_by_status": {},
+        "books_by_genre": {},
+        "books_by_author": {},
+        "active_loans_by_member": {},
+        "borrow_counts": {},
+        "top_borrowed": [],
+    }
+
+
+def _bump(counter: Dict[str, int], key: Optional[str], delta: int = 1):
+    """Adjust a keyed breakdown, dropping keys that reach zero (totals use plain += instead)"""
+    if key is None:
+        return
+    value = counter.get(key, 0) + delta
+    if value > 0:
+        counter[key] = value
+    else:
+        counter.pop(key, None)
+
+
+def _rank_key(entry) -> Tuple[int, str]:
+    """Highest count first, ties broken by book ID so rankings are deterministic"""
+    return -entry[1], entry[0]
+
+
+def _rank_top_borrowed(borrow_counts: Dict[str, int]) -> List[List[Any]]:
+    ranked = sorted(borrow_counts.items(), key=_rank_key)
+    return [[book_id, count] for book_id, count in ranked[:TOP_BORROWED_LIMIT]]
+
+
+def compute_stats(data: Dict[str, Any], borrow_counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Recompute all counters with a full scan of the library data"""
+    stats = empty_stats()
+    stats["totals"] = {
+        "authors": len(data["authors"]),
+        "books": len(data["books"]),
+        "members": len(data["members"]),
+    }
+    for book in data["books"].values():
+        _bump(stats["books_by_status"], book["status"])
+        _bump(stats["books_by_genre"], book.get("genre"))
+        _bump(stats["books_by_author"], book["author_id"])
+        _bump(stats["active_loans_by_member"], book.get("borrowed_by"))
+
+    borrow_counts = {book_id: count for book_id, count in (borrow_counts or {}).items()
+                     if book_id in data["books"]}
+    stats["borrow_counts"] = borrow_counts
+    stats["top_borrowed"] = _rank_top_borrowed(borrow_counts)
+    return stats
+
+
+class StatsStore:
+    """Catalog counters kept next to the data file and updated on each mutation.
+
+    Each update is a load-modify-write of the whole file, done under an
+    exclusive ``flock`` on a lock file beside it, so workers sharing the data
+    directory don't overwrite each other's increments.
+    """
+
+    def __init__(self, storage: "DataStorage", stats_file: Optional[str] = None):
+        self.storage = storage
+        self.stats_file = Path(stats_file) if stats_file else storage.data_file.with_name("library_stats.json")
+        self.lock_file = self.stats_file.with_name(f".{self.stats_file.name}.lock")
+        if not self.stats_file.exists():
+            self.rebuild()
+
+    def load(self) -> Dict[str, Any]:
+        """Return current counters, re-reading the file only when it has changed"""
+        try:
+            mtime = self.stats_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return self.rebuild()
+
+        cached = _cache.get(self.stats_file)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        stats = self._read()
+        if stats is None:
+            return self.rebuild()
+        _cache[self.stats_file] = (mtime, stats)
+        return stats
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid stats data: {e}")
+
+    @contextmanager
+    def _locked(self):
+        """Hold the stats file exclusively across threads and worker processes"""
+        with _update_lock, open(self.lock_file, 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    @contextmanager
+    def _updating(self):
+        """Yield the current counters for modification and save them, all under the lock.
+
+        The file is re-read rather than taken from the mtime cache, since two
+        workers' writes can land within one timestamp tick.
+        """
+        with self._locked():
+            stats = self._read() or self._rebuild()
+            yield stats
+            self.save(stats)
+
+    def save(self, stats: Dict[str, Any]):
+        """Save counters atomically, so readers in other workers never see a partial file"""
+        temp_file = self.stats_file.with_name(f".{self.stats_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as file:
+                json.dump(stats, file)
+            os.replace(temp_file, self.stats_file)
+        except Exception as e:
+            temp_file.unlink(missing_ok=True)
+            _cache.pop(self.stats_file, None)
+            raise HTTPException(status_code=500, detail=f"Failed to save stats: {e}")
+        _cache[self.stats_file] = (self.stats_file.stat().st_mtime_ns, stats)
+
+    def rebuild(self) -> Dict[str, Any]:
+        """Recompute counters from the data file, keeping borrow history"""
+        with self._locked():
+            return self._rebuild()
+
+    def _rebuild(self) -> Dict[str, Any]:
+        stored = self._read()
+        borrow_counts = stored.get("borrow_counts") if stored else None
+        stats = compute_stats(self.storage.load_data(), borrow_counts)
+        self.save(stats)
+        return stats
+
+    def verify(self) -> List[str]:
+        """Compare stored counters against a full recompute; return mismatched keys"""
+        stored = self.load()
+        expected = compute_stats(self.storage.load_data(), stored.get("borrow_counts"))
+        return [key for key in DERIVED_KEYS + ("top_borrowed",) if stored.get(key) != expected[key]]
+
+    # Incremental updates, called by LibraryService after a successful save
+    def record_author_created(self):
+        with self._updating() as stats:
+            stats["totals"]["authors"] += 1
+
+    def record_author_deleted(self):
+        with self._updating() as stats:
+            stats["totals"]["authors"] -= 1
+
+    def record_member_created(self):
+        with self._updating() as stats:
+            stats["totals"]["members"] += 1
+
+    def record_book_created(self, book: Dict[str, Any]):
+        with self._updating() as stats:
+            stats["totals"]["books"] += 1
+            _bump(stats["books_by_status"], book["status"])
+            _bump(stats["books_by_genre"], book.get("genre"))
+            _bump(stats["books_by_author"], book["author_id"])
+
+    def record_book_genre_changed(self, old_genre: Optional[str], new_genre: Optional[str]):
+        if old_genre == new_genre:
+            return
+        with self._updating() as stats:
+            _bump(stats["books_by_genre"], old_genre, -1)
+            _bump(stats["books_by_genre"], new_genre)
+
+    def record_book_borrowed(self, book_id: str, member_id: str):
+        with self._updating() as stats:
+            _bump(stats["books_by_status"], "available", -1)
+            _bump(stats["books_by_status"], "borrowed")
+            _bump(stats["active_loans_by_member"], member_id)
+            _bump(stats["borrow_counts"], book_id)
+            self._update_top_borrowed(stats, book_id)
+
+    def record_book_returned(self, member_id: str):
+        with self._updating() as stats:
+            _bump(stats["books_by_status"], "borrowed", -1)
+            _bump(stats["books_by_status"], "available")
+            _bump(stats["active_loans_by_member"], member_id, -1)
+
+    @staticmethod
+    def _update_top_borrowed(stats: Dict[str, Any], book_id: str):
+        """Keep the bounded leaderboard sorted; counts only grow so this stays exact"""
+        count = stats["borrow_counts"][book_id]
+        top = stats["top_borrowed"]
+        for entry in top:
+            if entry[0] == book_id:
+                entry[1] = count
+                break
+        else:
+            if len(top) < TOP_BORROWED_LIMIT:
+                top.append([book_id, count])
+            elif _rank_key((book_id, count)) < _rank_key(top[-1]):
+                top[-1] = [book_id, count]
+            else:
+                return
+        top.sort(key=_rank_key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify or rebuild library statistics")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--data-file", default="data/library_data.json")
+    args = parser.parse_args()
+
+    from .data_storage import DataStorage
+    store = StatsStore(DataStorage(args.data_file))
+    if args.command == "rebuild":
+        store.rebuild()
+        print(f"Rebuilt {store.stats_file}")
+        return
+
+    mismatches = store.verify()
+    if mismatches:
+        print(f"Stats out of date: {', '.join(mismatches)} (run 'rebuild' to fix)")
+        sys.exit(1)
+    print("Stats match a full recompute")
+
+
+if __name__ == "__main__":
+    main()
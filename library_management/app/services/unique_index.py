@@ -0,0 +1,68 @@
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class DuplicateValueError(ValueError):
+    """Raised when a create or update would reuse a value that must be unique"""
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def normalize_membership_id(membership_id: str) -> str:
+    return membership_id.strip().upper()
+
+
+def normalize_isbn(isbn: str) -> str:
+    return isbn.replace("-", "").replace(" ", "").upper()
+
+
+class UniqueIndex:
+    """Hash index from a normalized field value to the ID of the entity that owns it"""
+
+    def __init__(self, field: str, label: str, normalize: Callable[[str], str]):
+        self.field = field
+        self.label = label
+        self.normalize = normalize
+        self._owners: Dict[str, str] = {}
+
+    def build(self, records: Iterable[Dict[str, Any]]):
+        # If the data already holds duplicates, the first record keeps the value
+        self._owners = {}
+        for record in records:
+            value = record.get(self.field)
+            if value:
+                self._owners.setdefault(self.normalize(value), record["id"])
+
+    def owner(self, value: str) -> Optional[str]:
+        return self._owners.get(self.normalize(value))
+
+    def check(self, value: Optional[str], entity_id: Optional[str] = None):
+        """Raise DuplicateValueError if another entity already owns the value"""
+        if not value:
+            return
+        owner = self._owners.get(self.normalize(value))
+        if owner is not None and owner != entity_id:
+            raise DuplicateValueError(f"{self.label} already in use: {value}")
+
+    def update(self, entity_id: str, old_value: Optional[str], new_value: Optional[str]):
+        """Move ownership from the old value to the new one"""
+        if old_value and self._owners.get(self.normalize(old_value)) == entity_id:
+            del self._owners[self.normalize(old_value)]
+        if new_value:
+            self._owners[self.normalize(new_value)] = entity_id
+
+
+class LibraryIndexes:
+    """Unique indexes over member email, membership ID and book ISBN"""
+
+    def __init__(self):
+        self.email = UniqueIndex("email", "Email", normalize_email)
+        self.membership_id = UniqueIndex("membership_id", "Membership ID", normalize_membership_id)
+        self.isbn = UniqueIndex("isbn", "ISBN", normalize_isbn)
+
+    def build(self, members: Iterable[Dict[str, Any]], books: Iterable[Dict[str, Any]]):
+        members = list(members)
+        self.email.build(members)
+        self.membership_id.build(members)
+        self.isbn.build(books)
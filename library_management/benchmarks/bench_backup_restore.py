@@ -0,0 +1,78 @@
+"""Time full snapshots, incremental backups and restores.
+
+Run from the library_management directory:
+    python -m benchmarks.bench_backup_restore --count 1000000 --change-ratio 0.01
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from app.services.backup import BackupManager
+from app.services.data_storage import DataStorage
+
+
+def build_dataset(count: int):
+    """Split ``count`` entities across authors, books and members"""
+    authors = max(1, count // 10)
+    members = max(1, count // 5)
+    books = max(1, count - authors - members)
+    data = {"authors": {}, "books": {}, "members": {}}
+    for i in range(authors):
+        data["authors"][f"author-{i}"] = {
+            "id": f"author-{i}", "name": f"Author {i}", "biography": None, "birth_year": 1900,
+            "books": [], "created_at": "2025-06-20T16:59:02", "updated_at": "2025-06-20T16:59:02",
+        }
+    for i in range(books):
+        data["books"][f"book-{i}"] = {
+            "id": f"book-{i}", "title": f"Book {i}", "author_id": f"author-{i % authors}",
+            "isbn": f"{i:013d}", "pages": 100 + i % 500, "genre": "fiction", "status": "available",
+            "borrowed_by": None, "borrowed_date": None,
+            "created_at": "2025-06-20T16:59:02", "updated_at": "2025-06-20T16:59:02",
+        }
+    for i in range(members):
+        data["members"][f"member-{i}"] = {
+            "id": f"member-{i}", "name": f"Member {i}", "email": f"member{i}@example.com",
+            "membership_id": f"M{i:08d}", "phone": None, "borrowed_books": [],
+            "created_at": "2025-06-20T16:59:02", "updated_at": "2025-06-20T16:59:02",
+        }
+    return data
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<24} {time.perf_counter() - start:8.2f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--change-ratio", type=float, default=0.01)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(str(Path(tmp) / "library_data.json"))
+        data = build_dataset(args.count)
+        storage.save_data(data)
+        manager = BackupManager(storage)
+        print(f"{args.count} entities, data file {storage.data_file.stat().st_size / 1e6:.1f} MB")
+
+        full = timed("full snapshot", manager.snapshot)
+        books = data["books"]
+        for book_id in list(books)[:int(len(books) * args.change_ratio)]:
+            books[book_id]["status"] = "borrowed"
+        storage.save_data(data)
+        del data
+
+        incremental = timed("incremental backup", manager.incremental)
+        for entry in (full, incremental):
+            size = (manager.backup_dir / entry["name"]).stat().st_size / 1e6
+            print(f"  {entry['type']:<11} {entry['changed']:>9} entities {size:10.2f} MB")
+
+        timed("verify chain", lambda: manager.restore(dry_run=True))
+        timed("restore", manager.restore)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare the columnar book catalog with a scan over the stored book dicts.
+
+Run from the library_management directory:
+    python -m benchmarks.bench_columnar_filter --books 1000000
+"""
+import argparse
+import random
+import time
+from app.services.book_catalog import ColumnarBookCatalog
+from app.services.library_service import LibraryService
+
+STATUSES = ["available", "borrowed", "reserved", "maintenance"]
+GENRES = ["fiction", "history", "science", "poetry", "travel", "children", None]
+
+QUERIES = [
+    {"status": "available"},
+    {"status": "borrowed", "genre": "poetry"},
+    {"genre": "science", "min_pages": 200, "max_pages": 350},
+    {"author_id": "author-42"},
+    {"status": "available", "genre": "history", "min_pages": 500},
+]
+
+
+def build_books(count: int, authors: int):
+    rng = random.Random(1)
+    return {
+        f"book-{i}": {
+            "id": f"book-{i}", "title": f"Book {i}", "author_id": f"author-{rng.randrange(authors)}",
+            "isbn": f"{i:013d}", "pages": rng.randrange(40, 900), "genre": rng.choice(GENRES),
+            "status": rng.choices(STATUSES, weights=[70, 25, 3, 2])[0],
+            "borrowed_by": None, "borrowed_date": None,
+            "created_at": "2025-06-20T16:59:02", "updated_at": "2025-06-20T16:59:02",
+        }
+        for i in range(count)
+    }
+
+
+def dict_scan(service: LibraryService, books: dict, status=None, genre=None, author_id=None,
+              min_pages=None, max_pages=None, limit=None):
+    """The pre-catalog approach: visit every dict and build a Book per match"""
+    results = []
+    for book in books.values():
+        if status is not None and book["status"] != status:
+            continue
+        if genre is not None and book.get("genre") != genre:
+            continue
+        if author_id is not None and book["author_id"] != author_id:
+            continue
+        if min_pages is not None and book["pages"] < min_pages:
+            continue
+        if max_pages is not None and book["pages"] > max_pages:
+            continue
+        results.append(service._dict_to_book(book))
+        if limit is not None and len(results) >= limit:
+            break
+    return results
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=1_000_000)
+    parser.add_argument("--authors", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=100, help="page size for the limited runs")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    books = build_books(args.books, args.authors)
+    service = LibraryService.__new__(LibraryService)
+
+    start = time.perf_counter()
+    catalog = ColumnarBookCatalog.from_books(books.values())
+    print(f"{args.books} books; catalog built in {time.perf_counter() - start:.2f} s")
+
+    print(f"{'query':<62} {'matches':>8} {'scan ms':>9} {'cols ms':>9} {'scan@lim':>9} {'cols@lim':>9}")
+    for query in QUERIES:
+        matches = len(catalog.filter(**query))
+        assert matches == len(dict_scan(service, books, **query))
+        scan_ms = best_of(lambda: dict_scan(service, books, **query), args.repeat)
+        cols_ms = best_of(lambda: catalog.filter(**query), args.repeat)
+        scan_limit_ms = best_of(lambda: dict_scan(service, books, limit=args.limit, **query), args.repeat)
+        cols_limit_ms = best_of(lambda: catalog.filter(limit=args.limit, **query), args.repeat)
+        label = ", ".join(f"{key}={value}" for key, value in query.items())
+        print(f"{label:<62} {matches:>8} {scan_ms:>9.1f} {cols_ms:>9.1f} {scan_limit_ms:>9.1f} {cols_limit_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Compare peak RSS and time-to-first-byte of list vs streamed member listings.
+
+Books are written before members, as in a real data file, so the streamed
+listing pays for skipping the books collection before its first byte.
+
+Run from the library_management directory:
+    python -m benchmarks.bench_list_streaming --count 1000000 --books 1000000
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+
+def generate_dataset(path: Path, count: int, books: int):
+    """Write a library data file with ``books`` books and ``count`` members, one record at a time"""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('{"authors": {}, "books": {')
+        for i in range(books):
+            book_id = f"book-{i:08d}"
+            record = {
+                "id": book_id,
+                "title": f"Book {i} [vol. {i % 7}]",
+                "author_id": f"author-{i % 5000:08d}",
+                "isbn": f"978{i:010d}",
+                "pages": 100 + i % 900,
+                "genre": "Fiction",
+                "status": "available",
+                "borrowed_by": None,
+                "borrowed_date": None,
+                "created_at": "2025-06-20T16:59:02.770715",
+                "updated_at": "2025-06-20T16:59:02.770720",
+            }
+            file.write(("," if i else "") + json.dumps(book_id) + ": " + json.dumps(record))
+        file.write('}, "members": {')
+        for i in range(count):
+            member_id = f"member-{i:08d}"
+            record = {
+                "id": member_id,
+                "name": f"Member {i}",
+                "email": f"member{i}@example.com",
+                "membership_id": f"M{i:08d}",
+                "phone": "5550000000",
+                "borrowed_books": [],
+                "created_at": "2025-06-20T16:59:02.770715",
+                "updated_at": "2025-06-20T16:59:02.770720",
+            }
+            file.write(("," if i else "") + json.dumps(member_id) + ": " + json.dumps(record))
+        file.write("}}")
+
+
+def run_mode(mode: str, data_file: str):
+    """Produce the response body for one mode and print measurements as JSON"""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from app.routers.streaming import iter_json_array
+    from app.schemas.member_schemas import MemberResponse
+    from app.services.data_storage import DataStorage
+
+    storage = DataStorage(data_file)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    start = time.perf_counter()
+    ttfb = None
+    raw_bytes = compressed_bytes = 0
+
+    if mode == "list":
+        data = storage.load_data()
+        members = [MemberResponse(**record) for record in data["members"].values()]
+        chunks = [JSONResponse(content=jsonable_encoder(members)).body]
+    else:
+        chunks = iter_json_array(storage.iter_collection("members"), MemberResponse)
+
+    for chunk in chunks:
+        if ttfb is None and chunk != b"[":
+            ttfb = time.perf_counter() - start
+        raw_bytes += len(chunk)
+        compressed_bytes += len(compressor.compress(chunk))
+    compressed_bytes += len(compressor.flush())
+
+    print(json.dumps({
+        "mode": mode,
+        "ttfb_s": round(ttfb or 0.0, 4),
+        "total_s": round(time.perf_counter() - start, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "rss_growth_mb": round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024, 1),
+        "body_mb": round(raw_bytes / 1e6, 1),
+        "gzip_mb": round(compressed_bytes / 1e6, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--books", type=int, default=1_000_000)
+    parser.add_argument("--mode", choices=["list", "stream"])
+    parser.add_argument("--data-file")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.data_file)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / "library_data.json"
+        generate_dataset(data_file, args.count, args.books)
+        print(f"{args.books} books, {args.count} members, "
+              f"data file {data_file.stat().st_size / 1e6:.1f} MB")
+        # Each mode runs in a fresh interpreter so peak RSS is not shared
+        for mode in ("list", "stream"):
+            subprocess.run([sys.executable, "-m", "benchmarks.bench_list_streaming",
+                            "--mode", mode, "--data-file", str(data_file)], check=True)
+
+
+if __name__ == "__main__":
+    main()
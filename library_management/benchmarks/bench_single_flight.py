@@ -0,0 +1,62 @@
+"""Hot-key read load with and without single-flight coalescing.
+
+Run from the library_management directory:
+    python -m benchmarks.bench_single_flight --books 20000 --threads 64 --requests 2000
+"""
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from app.services.data_storage import DataStorage
+from app.services.library_service import LibraryService
+
+
+def build_storage(path: Path, books: int) -> DataStorage:
+    storage = DataStorage(str(path))
+    data = {"authors": {"author-0": {"id": "author-0", "name": "Hot Author", "books": []}},
+            "books": {}, "members": {}}
+    for i in range(books):
+        data["books"][f"book-{i}"] = {
+            "id": f"book-{i}", "title": f"Book {i}", "author_id": "author-0",
+            "isbn": f"{i:013d}", "pages": 100, "genre": "fiction", "status": "available",
+            "borrowed_by": None, "borrowed_date": None,
+        }
+    storage.save_data(data)
+    return storage
+
+
+def run(label: str, call, threads: int, requests: int):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: call(), range(requests)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:7.2f} s  {requests / elapsed:8.1f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = build_storage(Path(tmp) / "library_data.json", args.books)
+        print(f"{args.books} books, data file {storage.data_file.stat().st_size / 1e6:.1f} MB, "
+              f"{args.threads} threads, {args.requests} requests on one hot key")
+
+        service = LibraryService(storage)
+        run("get_book (uncoalesced)", lambda: service._load_book("book-0"), args.threads, args.requests)
+        run("get_book (single-flight)", lambda: service.get_book("book-0"), args.threads, args.requests)
+        print(f"  {service.get_read_coalescing_metrics()}")
+
+        service = LibraryService(storage)
+        requests = max(1, args.requests // 10)
+        run("search (uncoalesced)", lambda: service._search_books("book 1"), args.threads, requests)
+        run("search (single-flight)", lambda: service.search_books("book 1"), args.threads, requests)
+        print(f"  {service.get_read_coalescing_metrics()}")
+
+
+if __name__ == "__main__":
+    main()
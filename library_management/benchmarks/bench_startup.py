@@ -0,0 +1,79 @@
+"""Measure app import time with ``python -X importtime`` and enforce a budget.
+
+Run from the library_management directory:
+    python -m benchmarks.bench_startup --runs 5 --app-budget-ms 220
+
+Exits non-zero when the median import time of the app's own modules exceeds the
+budget, or when a module that should load lazily is imported at startup.
+
+Most of the app's own import time is FastAPI building routes and response
+models, so it grows with the number of endpoints; the default budget leaves
+about a third of headroom over the current ~160 ms. The lazy-module check is
+the stricter guard and does not depend on the machine.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+# Modules that must only be imported on the first request
+LAZY_MODULES = ("app.services.library_service", "app.services.data_storage", "uvicorn",
+                "cProfile", "pstats")
+
+
+def measure_once(target: str) -> Tuple[float, float, Dict[str, int]]:
+    """Import the target in a fresh interpreter; return (total_ms, app_self_ms, self_us per module)"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                            capture_output=True, text=True, check=True)
+    self_times: Dict[str, int] = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        module = module.strip()
+        self_times[module] = int(self_us)
+        if module == target:
+            total_us = int(cumulative_us)
+    app_self_us = sum(us for module, us in self_times.items()
+                      if module == "app" or module.startswith("app."))
+    return total_us / 1000, app_self_us / 1000, self_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--app-budget-ms", type=float, default=220.0,
+                        help="budget for the summed self time of app.* modules")
+    parser.add_argument("--total-budget-ms", type=float,
+                        help="optional budget for the cumulative import time, dependencies included")
+    args = parser.parse_args()
+
+    runs = [measure_once(args.target) for _ in range(args.runs)]
+    total_ms = statistics.median(run[0] for run in runs)
+    app_ms = statistics.median(run[1] for run in runs)
+    slowest = sorted(((us, module) for module, us in runs[-1][2].items()
+                      if module.startswith("app.")), reverse=True)[:5]
+
+    print(f"{args.target}: total {total_ms:.1f} ms, app modules {app_ms:.1f} ms (median of {args.runs})")
+    for us, module in slowest:
+        print(f"  {module:<40} {us / 1000:6.1f} ms")
+
+    failures = []
+    if app_ms > args.app_budget_ms:
+        failures.append(f"app modules took {app_ms:.1f} ms, budget {args.app_budget_ms:.1f} ms")
+    if args.total_budget_ms is not None and total_ms > args.total_budget_ms:
+        failures.append(f"total import took {total_ms:.1f} ms, budget {args.total_budget_ms:.1f} ms")
+    eager = [module for module in LAZY_MODULES if module in runs[-1][2]]
+    if eager:
+        failures.append(f"imported at startup but should be lazy: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
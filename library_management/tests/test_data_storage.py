@@ -0,0 +1,83 @@
+"""Check DataStorage.iter_collection against json.load on randomized files.
+
+Run from the library_management directory:
+    python -m pytest tests
+"""
+import json
+import random
+
+import pytest
+
+from app.services.data_storage import DataStorage
+
+COLLECTIONS = ["authors", "books", "members"]
+
+# Characters that stress the scanner: brackets and quotes inside strings,
+# escapes, separators and non-ASCII text (escaped or raw depending on ensure_ascii)
+ALPHABETS = {
+    "mixed": 'ab{}[]"\\/ \n\té😀,:',
+    "brackets": "abc{}[] ",
+    "quotes": 'xy"{}',
+    "non_ascii": "é{ü}",
+}
+
+
+def _random_string(rng: random.Random, alphabet: str) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+
+
+def _random_value(rng: random.Random, alphabet: str, depth: int = 0):
+    roll = rng.random()
+    if depth > 3 or roll < 0.4:
+        return rng.choice([_random_string(rng, alphabet), rng.randint(-5, 5), 1.5, None, True, False])
+    if roll < 0.7:
+        return [_random_value(rng, alphabet, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {_random_string(rng, alphabet): _random_value(rng, alphabet, depth + 1)
+            for _ in range(rng.randint(0, 4))}
+
+
+def _random_data(rng: random.Random, alphabet: str) -> dict:
+    # Collection order varies so every collection is sometimes skipped before the target
+    names = rng.sample(COLLECTIONS + ["extra"], 4)
+    return {
+        name: {
+            f"k{i}{_random_string(rng, alphabet)}": {
+                _random_string(rng, alphabet): _random_value(rng, alphabet, 1)
+                for _ in range(rng.randint(0, 4))
+            }
+            for i in range(rng.randint(0, 8))
+        }
+        for name in names
+    }
+
+
+@pytest.mark.parametrize("alphabet", ALPHABETS.values(), ids=ALPHABETS.keys())
+def test_iter_collection_matches_json_load(tmp_path, alphabet):
+    rng = random.Random(alphabet)
+    data_file = tmp_path / "library_data.json"
+    storage = DataStorage(str(data_file))
+    for _ in range(120):
+        data = _random_data(rng, alphabet)
+        with open(data_file, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=rng.choice([None, 4]), ensure_ascii=rng.random() < 0.5)
+        for name in COLLECTIONS:
+            # Small read sizes put every token on a buffer boundary at some point
+            chunk_size = rng.choice([1, 2, 3, 7, 64, 4096])
+            assert list(storage.iter_collection(name, chunk_size=chunk_size)) == list(data[name].values())
+
+
+def test_skipped_collection_with_escaped_quotes_and_brackets(tmp_path):
+    data = {
+        "books": {"b1": {"id": "b1", "title": 'He said "}]" and left \\', "tags": ["[", "{"]}},
+        "members": {"m1": {"id": "m1", "name": "Zoë"}},
+    }
+    data_file = tmp_path / "library_data.json"
+    storage = DataStorage(str(data_file))
+    storage.save_data(data)
+    for chunk_size in (1, 5, 64 * 1024):
+        assert list(storage.iter_collection("members", chunk_size=chunk_size)) == [data["members"]["m1"]]
+
+
+def test_missing_collection_yields_nothing(tmp_path):
+    storage = DataStorage(str(tmp_path / "library_data.json"))
+    assert list(storage.iter_collection("loans")) == []
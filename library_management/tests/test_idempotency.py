@@ -0,0 +1,41 @@
+import itertools
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.idempotency import IdempotencyMiddleware
+
+
+def _app():
+    app = FastAPI()
+    counter = itertools.count(1)
+
+    @app.post("/orders")
+    def create_order():
+        return {"order": next(counter)}
+
+    app.add_middleware(IdempotencyMiddleware)
+    return app
+
+
+def _post(app, client_host):
+    async def from_client(scope, receive, send):
+        await app({**scope, "client": (client_host, 50000)}, receive, send)
+
+    return TestClient(from_client).post("/orders", json={}, headers={"Idempotency-Key": "k-1"})
+
+
+def test_retry_from_same_client_is_replayed():
+    app = _app()
+    first, retry = _post(app, "10.0.0.1"), _post(app, "10.0.0.1")
+
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+
+
+def test_same_key_from_another_client_is_not_shared():
+    app = _app()
+    first, other = _post(app, "10.0.0.1"), _post(app, "10.0.0.2")
+
+    assert other.json() != first.json()
+    assert "idempotent-replayed" not in other.headers
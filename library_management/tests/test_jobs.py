@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from app.jobs.engine import BatchJob, CheckpointStore, JobRunner, JobScheduler, Schedule
+from app.jobs.library_jobs import expired_hold
+from app.jobs.sinks import JsonLinesSink
+from app.services.data_storage import DataStorage
+
+
+def _storage(tmp_path, count):
+    storage = DataStorage(str(tmp_path / "library_data.json"))
+    data = storage.load_data()
+    data["books"] = {f"b{n:03d}": {"id": f"b{n:03d}"} for n in range(count)}
+    storage.save_data(data)
+    return storage
+
+
+def test_failed_run_is_logged_recorded_and_resumed(tmp_path, caplog):
+    storage = _storage(tmp_path, 30)
+    fail = {"on": "b015"}
+
+    def process(record, as_of):
+        if record["id"] == fail["on"]:
+            raise RuntimeError("sink unavailable")
+        return {"id": record["id"]}
+
+    job = BatchJob("copy", "books", {"copied": process}, Schedule(every_seconds=3600), chunk_size=10)
+    runner = JobRunner(storage, CheckpointStore(str(tmp_path / "checkpoints.json")), pause_seconds=0)
+
+    async def run_twice():
+        scheduler = JobScheduler(runner)
+        scheduler.register(job, JsonLinesSink(str(tmp_path / "out")))
+        failed = await scheduler.run_now("copy")
+        status = scheduler.status()[0]
+        fail["on"] = None
+        finished = await scheduler.run_now("copy")
+        await scheduler.stop()
+        return failed, status, finished
+
+    with caplog.at_level(logging.ERROR, logger="app.jobs.engine"):
+        failed, status, finished = asyncio.run(run_twice())
+
+    assert "Job copy failed" in caplog.text
+    assert failed["error"] == "RuntimeError: sink unavailable"
+    assert failed["processed"] == 10 and not failed["completed"]
+    assert status["checkpoint"]["error"] == failed["error"] and not status["running"]
+    assert finished["completed"] and finished["processed"] == 30
+    assert "error" not in finished
+
+
+def test_expired_hold_prefers_reserved_date():
+    as_of = datetime(2024, 1, 10)
+    book = {"id": "b1", "status": "reserved", "updated_at": "2024-01-09T00:00:00"}
+    assert expired_hold(book, as_of) is None
+
+    notice = expired_hold({**book, "reserved_date": "2024-01-01T00:00:00"}, as_of)
+    assert notice["reserved_since"] == "2024-01-01T00:00:00"
+    assert notice["days_reserved"] == 9
@@ -0,0 +1,109 @@
+import pytest
+
+from app.models.member import Member
+from app.services.data_storage import DataStorage
+from app.services.library_service import LibraryService
+
+
+@pytest.fixture
+def service(tmp_path):
+    return LibraryService(DataStorage(str(tmp_path / "library_data.json")))
+
+
+def _book(service, author_id, n):
+    return service.create_book(f"Book {n}", author_id, f"978000000{n:04d}", pages=100)
+
+
+def test_borrow_and_return_update_book_member_and_stats(service):
+    author = service.create_author("Author")
+    book = _book(service, author.id, 1)
+    member = service.create_member("Reader", "reader@example.com", "M-1")
+
+    assert service.borrow_book(book.id, member.id)
+    assert service.get_book(book.id).status.value == "borrowed"
+    assert service.get_member(member.id).borrowed_books == [book.id]
+    assert service.filter_books(status="borrowed")[0]["id"] == book.id
+    stats = service.get_stats()
+    assert stats["top_borrowed"] == [[book.id, 1]]
+    assert stats["books_by_status"] == {"borrowed": 1}
+    assert stats["active_loans_by_member"] == {member.id: 1}
+
+    with pytest.raises(ValueError):
+        service.borrow_book(book.id, member.id)
+
+    assert service.return_book(book.id, member.id)
+    assert service.get_book(book.id).is_available
+    assert service.get_member(member.id).borrowed_books == []
+    assert service.get_stats()["active_loans_by_member"] == {}
+    assert service.stats.verify() == []
+
+
+def test_borrowing_limit(service):
+    author = service.create_author("Author")
+    member = service.create_member("Reader", "reader@example.com", "M-1")
+    for n in range(Member.MAX_BORROWED_BOOKS):
+        assert service.borrow_book(_book(service, author.id, n).id, member.id)
+
+    extra = _book(service, author.id, 99)
+    with pytest.raises(ValueError, match="borrowing limit"):
+        service.borrow_book(extra.id, member.id)
+
+
+def test_read_after_local_write_does_not_join_older_load(service, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    import threading
+
+    author = service.create_author("Author")
+    book = _book(service, author.id, 1)
+    loaded, release = threading.Event(), threading.Event()
+    load_book = service._load_book
+
+    def slow_first_load(book_id):
+        result = load_book(book_id)
+        if not loaded.is_set():
+            loaded.set()
+            release.wait(5)
+        return result
+    monkeypatch.setattr(service, "_load_book", slow_first_load)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        stale = pool.submit(service.get_book, book.id)
+        loaded.wait(5)
+        try:
+            service.update_book(book.id, title="Renamed")
+            fresh = pool.submit(service.get_book, book.id).result(timeout=2)
+        finally:
+            release.set()
+        assert fresh.name == "Renamed"
+        assert stale.result().name == "Book 1"
+
+
+def test_catalog_build_does_not_block_writes(service, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    import os
+    import threading
+
+    author = service.create_author("Author")
+    first = _book(service, author.id, 1)
+    building, release = threading.Event(), threading.Event()
+    build_catalog = service._build_catalog
+
+    def slow_build():
+        catalog = build_catalog()
+        building.set()
+        release.wait(5)
+        return catalog
+    monkeypatch.setattr(service, "_build_catalog", slow_build)
+    # Make the next filter rebuild, as after a write by another process
+    os.utime(service.storage.data_file, ns=(0, 0))
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        snapshot = pool.submit(service.filter_books)
+        building.wait(5)
+        try:
+            second = pool.submit(_book, service, author.id, 2).result(timeout=2)
+        finally:
+            release.set()
+        assert [book["id"] for book in snapshot.result()] == [first.id]
+
+    assert {book["id"] for book in service.filter_books()} == {first.id, second.id}
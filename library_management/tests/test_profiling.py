@@ -0,0 +1,59 @@
+import cProfile
+import marshal
+import sys
+
+import anyio.to_thread
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.profiling import CPROFILE, SAMPLE, ProfileStore, ProfilingMiddleware
+
+TOKEN = "test-token"
+
+
+def sync_endpoint_work():
+    return sum(range(1000))
+
+
+@pytest.fixture
+def store():
+    return ProfileStore()
+
+
+@pytest.fixture
+def client(store):
+    app = FastAPI()
+
+    @app.get("/work")
+    def work():
+        return {"total": sync_endpoint_work()}
+
+    app.add_middleware(ProfilingMiddleware, token=TOKEN, store=store)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("mode", [CPROFILE, SAMPLE])
+def test_capture_includes_worker_thread_and_restores_run_sync(client, store, mode):
+    original = anyio.to_thread.run_sync
+    response = client.get("/work", headers={"X-Profile-Token": TOKEN, "X-Profile-Mode": mode})
+
+    assert response.status_code == 200
+    capture = store.get(int(response.headers["x-profile-id"]))
+    assert capture.mode == mode
+    if mode == CPROFILE:
+        assert "sync_endpoint_work" in {function for _, _, function in marshal.loads(capture.data)}
+    assert anyio.to_thread.run_sync is original
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="profilers only conflict through sys.monitoring")
+def test_request_is_served_when_another_profiler_is_active(client):
+    other = cProfile.Profile()
+    other.enable()
+    try:
+        response = client.get("/work", headers={"X-Profile-Token": TOKEN})
+    finally:
+        other.disable()
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
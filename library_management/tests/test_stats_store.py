@@ -0,0 +1,47 @@
+from app.services.data_storage import DataStorage
+from app.services.library_service import LibraryService
+
+
+def test_deleting_last_author_keeps_zero_total(tmp_path):
+    service = LibraryService(DataStorage(str(tmp_path / "library_data.json")))
+    author = service.create_author("Only Author")
+    assert service.delete_author(author.id)
+
+    stats = service.get_stats()
+    assert stats["totals"] == {"authors": 0, "books": 0, "members": 0}
+    assert service.stats.verify() == []
+
+
+def test_stats_failure_does_not_fail_saved_create(tmp_path, monkeypatch):
+    service = LibraryService(DataStorage(str(tmp_path / "library_data.json")))
+
+    def fail():
+        raise OSError("disk full")
+    monkeypatch.setattr(service.stats, "record_author_created", fail)
+
+    author = service.create_author("Saved Anyway")
+    assert service.get_author(author.id) is not None
+    assert service.stats.verify() == ["totals"]
+
+
+
+def _record_members(data_file, count):
+    from app.services.stats_store import StatsStore
+    store = StatsStore(DataStorage(data_file))
+    for _ in range(count):
+        store.record_member_created()
+
+
+def test_concurrent_workers_do_not_lose_updates(tmp_path):
+    import multiprocessing
+    from app.services.stats_store import StatsStore
+
+    data_file = str(tmp_path / "library_data.json")
+    store = StatsStore(DataStorage(data_file))
+    workers = [multiprocessing.Process(target=_record_members, args=(data_file, 50)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert store.load()["totals"]["members"] == 200